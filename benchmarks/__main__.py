@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Benchmarks: runner """
+
+import sys
+import json
+import argparse
+import importlib
+import traceback
+
+
+SUITES = ["resolver", "bundle", "logs", "announcer", "splash"]
+
+
+def _print_table(results):
+    print(f"{'Benchmark':<48} {'ops':>8} {'ops/s':>12} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+    #
+    for item in results:
+        print(
+            f"{item['name']:<48} {item['ops']:>8} {item['ops_per_sec']:>12.1f} "
+            f"{item['p50_ms']:>10.3f} {item['p95_ms']:>10.3f} {item['max_ms']:>10.3f}"
+        )
+
+
+def _compare(results, baseline_path, tolerance):
+    with open(baseline_path, "r", encoding="utf-8") as file:
+        baseline = {item["name"]: item for item in json.load(file)}
+    #
+    regressions = []
+    #
+    for item in results:
+        base = baseline.get(item["name"], None)
+        if base is None or not base["ops_per_sec"]:
+            continue
+        #
+        ratio = item["ops_per_sec"] / base["ops_per_sec"]
+        if ratio < 1.0 - tolerance:
+            regressions.append((item["name"], base["ops_per_sec"], item["ops_per_sec"], ratio))
+    #
+    for name, before, after, ratio in regressions:
+        print(f"REGRESSION {name}: {before:.1f} -> {after:.1f} ops/s ({ratio:.0%})")
+    #
+    return regressions
+
+
+def main():
+    """ Entry point """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("suites", nargs="*", choices=[[], *SUITES], default=[])
+    parser.add_argument("--quick", action="store_true", help="smaller sizes, shorter runs")
+    parser.add_argument("--json", dest="json_path", help="save results to file")
+    parser.add_argument("--baseline", help="compare with saved results, exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed ops/s drop")
+    args = parser.parse_args()
+    #
+    results = []
+    failed = False
+    #
+    for suite in args.suites or SUITES:
+        try:
+            module = importlib.import_module(f"{__package__}.bench_{suite}")
+            results.extend(module.run(quick=args.quick))
+        except:  # pylint: disable=W0702
+            print(f"Suite {suite} failed:", file=sys.stderr)
+            traceback.print_exc()
+            failed = True
+    #
+    _print_table(results)
+    #
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    #
+    if args.baseline and _compare(results, args.baseline, args.tolerance):
+        failed = True
+    #
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Benchmarks: RuntimeAnnoucer info collection with many descriptors """
+
+import json
+import types
+import tempfile
+
+from .common import load_plugin_module, measure
+from . import stand_ins
+
+
+def _make_descriptor(idx, path):
+    return types.SimpleNamespace(
+        name=f"plugin_{idx}",
+        metadata={
+            "name": f"Plugin {idx}",
+            "version": "1.0",
+            "depends_on": [f"plugin_{dep}" for dep in range(max(idx - 3, 0), idx)],
+        },
+        prepared=True,
+        activated=True,
+        config={"option": idx, "nested": {"values": list(range(20))}},
+        config_data=b"option: 1\nnested:\n  values: [1, 2, 3]\n",
+        path=path,
+    )
+
+
+def run(quick=False):
+    """ Run benchmarks """
+    event = load_plugin_module("tools.event")
+    #
+    results = []
+    #
+    with tempfile.TemporaryDirectory() as path:
+        for count in ([100] if quick else [100, 500]):
+            module = stand_ins.make_module()
+            module.context.module_manager.descriptors = {
+                f"plugin_{idx}": _make_descriptor(idx, path)
+                for idx in range(count)
+            }
+            #
+            for light in [False, True]:
+                announcer = event.RuntimeAnnoucer(module, {"light": light})
+                mode = "light" if light else "full"
+                #
+                result = measure(
+                    f"announcer.collect_info.{count}.{mode}",
+                    announcer._collect_info,  # pylint: disable=W0212
+                    duration=0.5 if quick else 2.0,
+                    descriptors=count,
+                )
+                result["payload_bytes"] = len(json.dumps(announcer._collect_info(), default=str))  # pylint: disable=W0212
+                results.append(result)
+    #
+    return results
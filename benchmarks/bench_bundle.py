@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Benchmarks: get_bundle download and extraction """
+
+import types
+import shutil
+import tempfile
+
+from .common import load_plugin_module, measure, make_tree, make_tar, make_zip, StandInServer
+
+
+SIZES = [
+    # (files, file size)
+    (10, 1024),
+    (200, 4096),
+    (2000, 1024),
+    (20, 1024 * 1024),
+]
+
+
+def run(quick=False):
+    """ Run benchmarks """
+    module = load_plugin_module("module")
+    #
+    sizes = SIZES[:2] if quick else SIZES
+    routes = {}
+    #
+    for files, file_size in sizes:
+        tree = make_tree(files, file_size, root="bundle")
+        routes[f"/public/depot/main/bundles/zip_{files}x{file_size}/data"] = (
+            "application/zip", make_zip(tree),
+        )
+        routes[f"/public/depot/main/bundles/tar_{files}x{file_size}/data"] = (
+            "application/gzip", make_tar(tree),
+        )
+    #
+    results = []
+    #
+    with StandInServer(routes) as server:
+        bootstrap = module.Module(
+            types.SimpleNamespace(id="benchmark"),
+            types.SimpleNamespace(config={}, state={}),
+        )
+        bootstrap.repo_resolver = types.SimpleNamespace(repo_config={
+            "type": "repo_depot",
+            "repo_url": server.url,
+            "release": "main",
+        })
+        #
+        for files, file_size in sizes:
+            for kind in ["zip", "tar"]:
+                target = tempfile.mkdtemp(prefix="bootstrap_bench_bundle_")
+                #
+                try:
+                    results.append(measure(
+                        f"bundle.{kind}_extract.{files}x{file_size}",
+                        lambda kind=kind, files=files, file_size=file_size, target=target:
+                            bootstrap.get_bundle(
+                                f"{kind}_{files}x{file_size}",
+                                processing=f"{kind}_extract",
+                                extract_target=target,
+                                extract_cleanup=True,
+                            ),
+                        iterations=3 if quick else 10,
+                        warmup=1,
+                        files=files,
+                        bytes=files * file_size,
+                    ))
+                finally:
+                    shutil.rmtree(target, ignore_errors=True)
+    #
+    return results
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Benchmarks: LocalListLogHandler throughput """
+
+import logging
+
+from .common import load_plugin_module, measure
+
+
+def run(quick=False):
+    """ Run benchmarks """
+    logs = load_plugin_module("tools.logs")
+    #
+    results = []
+    #
+    for max_size in [1000, 10000]:
+        handler = logs.LocalListLogHandler(target_list=[], max_size=max_size)
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s"))
+        #
+        logger = logging.getLogger(f"bootstrap_benchmark_{max_size}")
+        logger.propagate = False
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(handler)
+        #
+        batch = 1000
+        #
+        def _emit(logger=logger):
+            for idx in range(batch):
+                logger.info("Benchmark log line %s with some payload", idx)
+        #
+        result = measure(
+            f"logs.emit.max_size_{max_size}",
+            _emit,
+            duration=0.5 if quick else 2.0,
+            batch=batch,
+        )
+        result["lines_per_sec"] = result["ops_per_sec"] * batch
+        results.append(result)
+        #
+        results.append(measure(
+            f"logs.get_since.max_size_{max_size}",
+            lambda handler=handler: handler.get_since(handler.sequence - 100, 100),
+            duration=0.5 if quick else 1.0,
+        ))
+        #
+        logger.removeHandler(handler)
+    #
+    return results
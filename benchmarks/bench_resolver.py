@@ -0,0 +1,141 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Benchmarks: RepoResolver lookups and source fetches against local stand-in server """
+
+import json
+
+from .common import load_plugin_module, measure, make_tree, make_tar, make_zip, StandInServer
+from . import stand_ins
+
+
+METADATA_PROVIDER = {"type": "benchmarks.stand_in_providers.metadata"}
+SOURCE_PROVIDER = {"type": "benchmarks.stand_in_providers.source"}
+
+
+def _make_routes(plugins, source_tar, source_zip):
+    routes = {}
+    #
+    for plugin in plugins:
+        metadata = ("application/json", json.dumps({"name": plugin, "version": "1.0"}).encode())
+        #
+        routes[f"/depot/main/plugins/{plugin}/metadata"] = metadata
+        routes[f"/depot/main/plugins/{plugin}/source"] = ("application/gzip", source_tar)
+        routes[f"/raw/bench/{plugin}/main/metadata.json"] = metadata
+        routes[f"/codeload/bench/{plugin}/tar.gz/refs/heads/main"] = ("application/gzip", source_tar)
+        routes[f"/codeload/bench/{plugin}/zip/refs/heads/main"] = ("application/zip", source_zip)
+        routes[f"/gogs/{plugin}/raw/main/metadata.json"] = metadata
+    #
+    return routes
+
+
+def _make_configs(server_url, plugins):
+    common = {
+        "metadata_provider": METADATA_PROVIDER,
+        "source_provider": SOURCE_PROVIDER,
+    }
+    #
+    return {
+        "config": {
+            "type": "config",
+            "data": {
+                plugin: {
+                    "source": {"type": "git", "source": f"{server_url}/{plugin}.git"},
+                    "objects": {"metadata": f"{server_url}/{plugin}/metadata.json"},
+                }
+                for plugin in plugins
+            },
+            **common,
+        },
+        "depot": {"type": "depot", "url": server_url, "group": "main", **common},
+        "github": {"type": "github", "namespace": "bench", **common},
+        "github_zip": {"type": "github_zip", "namespace": "bench", **common},
+        "github_tar": {"type": "github_tar", "namespace": "bench", **common},
+        "gogs": {"type": "gogs", "base_url": f"{server_url}/gogs", **common},
+    }
+
+
+def run(quick=False):
+    """ Run benchmarks """
+    repo = load_plugin_module("tools.repo")
+    #
+    plugin_count = 20 if quick else 100
+    plugins = [f"plugin_{idx}" for idx in range(plugin_count)]
+    tree = make_tree(50, 4096)
+    #
+    results = []
+    #
+    with StandInServer(_make_routes(plugins, make_tar(tree), make_zip(tree))) as server:
+        stand_ins.REWRITE.update({
+            "https://raw.githubusercontent.com": f"{server.url}/raw",
+            "https://codeload.github.com": f"{server.url}/codeload",
+        })
+        #
+        for repo_type, repo_config in _make_configs(server.url, plugins).items():
+            module = stand_ins.make_module()
+            #
+            def _cold_lookup(repo_config=repo_config, module=module):
+                resolver = repo.RepoResolver(module, repo_config)
+                resolver.init()
+                #
+                for plugin in plugins:
+                    resolver.find(plugin)
+                #
+                resolver.find("missing_plugin")
+                resolver.deinit()
+            #
+            results.append(measure(
+                f"resolver.{repo_type}.cold_lookup",
+                _cold_lookup,
+                iterations=3 if quick else 10,
+                warmup=1,
+                plugins=plugin_count,
+            ))
+            #
+            resolver = repo.RepoResolver(module, [repo_config])
+            resolver.init()
+            #
+            for plugin in plugins:
+                resolver.find(plugin)
+            #
+            results.append(measure(
+                f"resolver.{repo_type}.cached_find",
+                lambda resolver=resolver: [resolver.find(plugin) for plugin in plugins],
+                duration=0.5 if quick else 1.0,
+                plugins=plugin_count,
+            ))
+            #
+            if repo_type in ["depot", "github_zip", "github_tar"]:
+                def _fetch(resolver=resolver):
+                    found_resolver, info = resolver.find(plugins[0])
+                    target = info["source"].copy()
+                    target.pop("type")
+                    found_resolver.source_provider.get_source(target)
+                    found_resolver.source_provider.deinit()
+                    found_resolver.source_provider.init()
+                #
+                results.append(measure(
+                    f"resolver.{repo_type}.fetch_source",
+                    _fetch,
+                    iterations=5 if quick else 20,
+                    warmup=1,
+                    files=len(tree),
+                ))
+            #
+            resolver.deinit()
+    #
+    return results
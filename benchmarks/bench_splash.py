@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Benchmarks: maintenance_splash_hook requests/s with stubbed RPC manager """
+
+import sys
+import time
+import types
+
+from werkzeug.test import EnvironBuilder  # pylint: disable=E0401
+
+from .common import load_plugin_module, measure
+
+
+class StandInRpc:
+    """ Stand-in auth RPCs """
+
+    def __init__(self, auth_type="public", roles=(), latency=0.0):
+        self.auth_type = auth_type
+        self.roles = list(roles)
+        self.latency = latency
+
+    def timeout(self, _value):
+        """ Same object, timeouts are not enforced """
+        return self
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def auth_authorize(self, source, headers, cookies):  # pylint: disable=W0613
+        """ Stand-in """
+        self._wait()
+        #
+        if self.auth_type == "public":
+            return {"auth_ok": False, "headers": {}}
+        #
+        return {
+            "auth_ok": True,
+            "headers": {
+                "X-Auth-Type": self.auth_type,
+                "X-Auth-ID": "1",
+                "X-Auth-Reference": "benchmark",
+            },
+        }
+
+    def auth_get_token(self, token_id):  # pylint: disable=W0613
+        """ Stand-in """
+        self._wait()
+        return {"user_id": 1}
+
+    def auth_get_user_roles(self, user_id, mode):  # pylint: disable=W0613
+        """ Stand-in """
+        self._wait()
+        return self.roles
+
+
+def _install_runtime(rpc):
+    runtime = types.ModuleType("tools")
+    runtime.context = types.SimpleNamespace(url_prefix="", rpc_manager=rpc)
+    runtime.this = types.SimpleNamespace(descriptor=types.SimpleNamespace(config={}))
+    sys.modules["tools"] = runtime
+    return runtime
+
+
+SCENARIOS = {
+    # name: (path, cookies, auth type, roles)
+    "health": ("/healthz/", {}, "public", ()),
+    "bypass_cookie": ("/app/", {"maintenance_splash_bypass": "bypass"}, "public", ()),
+    "public_splash": ("/app/", {}, "public", ()),
+    "admin_user": ("/app/", {}, "user", ("admin",)),
+    "token_user_splash": ("/api/", {}, "token", ()),
+}
+
+
+def run(quick=False):
+    """ Run benchmarks """
+    runtime = _install_runtime(StandInRpc())
+    splash = load_plugin_module("tools.splash")
+    #
+    router = types.SimpleNamespace(map={"/healthz/": None})
+    results = []
+    #
+    for name, (path, cookies, auth_type, roles) in SCENARIOS.items():
+        runtime.context.rpc_manager = StandInRpc(auth_type, roles)
+        #
+        builder = EnvironBuilder(
+            path=path,
+            headers={
+                "Cookie": "; ".join(f"{key}={value}" for key, value in cookies.items()),
+                "User-Agent": "benchmark",
+            },
+        )
+        environ = builder.get_environ()
+        #
+        result = measure(
+            f"splash.hook.{name}",
+            lambda environ=environ: splash.maintenance_splash_hook(router, environ.copy(), None),
+            duration=0.5 if quick else 2.0,
+        )
+        results.append(result)
+    #
+    return results
@@ -0,0 +1,167 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Benchmarks: common helpers """
+
+import io
+import os
+import sys
+import time
+import types
+import tarfile
+import zipfile
+import threading
+import importlib
+import http.server
+
+
+PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLUGIN_PACKAGE = "bootstrap"
+
+
+def load_plugin_module(name):
+    """ Import plugin submodule (e.g. 'tools.repo') without running plugin __init__ """
+    if PLUGIN_PACKAGE not in sys.modules:
+        package = types.ModuleType(PLUGIN_PACKAGE)
+        package.__path__ = [PLUGIN_ROOT]
+        sys.modules[PLUGIN_PACKAGE] = package
+    #
+    return importlib.import_module(f"{PLUGIN_PACKAGE}.{name}")
+
+
+def measure(name, func, iterations=None, duration=1.0, warmup=3, **info):
+    """ Run func repeatedly, return result dict with throughput and latency percentiles """
+    for _ in range(warmup):
+        func()
+    #
+    timings = []
+    started = time.perf_counter()
+    #
+    while True:
+        call_started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - call_started)
+        #
+        if iterations is not None:
+            if len(timings) >= iterations:
+                break
+        elif time.perf_counter() - started >= duration:
+            break
+    #
+    total = time.perf_counter() - started
+    timings.sort()
+    #
+    def _percentile(value):
+        return timings[min(int(len(timings) * value), len(timings) - 1)]
+    #
+    return {
+        "name": name,
+        "ops": len(timings),
+        "seconds": total,
+        "ops_per_sec": len(timings) / total if total else 0.0,
+        "p50_ms": _percentile(0.50) * 1000,
+        "p95_ms": _percentile(0.95) * 1000,
+        "max_ms": timings[-1] * 1000,
+        **info,
+    }
+
+
+def make_tree(file_count, file_size, root="plugin"):
+    """ Make {path: bytes} tree """
+    payload = os.urandom(max(file_size // 4, 1)) * 4
+    #
+    return {
+        f"{root}/dir_{idx % 16}/file_{idx}.py": payload[:file_size]
+        for idx in range(file_count)
+    }
+
+
+def make_tar(tree):
+    """ Make tar.gz bytes from tree """
+    data = io.BytesIO()
+    #
+    with tarfile.open(fileobj=data, mode="w:gz") as tar_file:
+        for path, content in tree.items():
+            info = tarfile.TarInfo(path)
+            info.size = len(content)
+            tar_file.addfile(info, io.BytesIO(content))
+    #
+    return data.getvalue()
+
+
+def make_zip(tree):
+    """ Make zip bytes from tree """
+    data = io.BytesIO()
+    #
+    with zipfile.ZipFile(data, mode="w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        for path, content in tree.items():
+            zip_file.writestr(path, content)
+    #
+    return data.getvalue()
+
+
+class StandInServer:
+    """ Local HTTP server serving static routes: {path: (content type, bytes)} """
+
+    def __init__(self, routes=None):
+        self.routes = routes if routes is not None else {}
+        self.requests = 0
+        #
+        server = self
+        #
+        class Handler(http.server.BaseHTTPRequestHandler):  # pylint: disable=C0115
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):  # pylint: disable=W0221
+                pass
+
+            def do_GET(self):  # pylint: disable=C0103,C0116
+                server.requests += 1
+                route = server.routes.get(self.path.split("?", 1)[0], None)
+                #
+                if route is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                #
+                content_type, content = route
+                #
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(content)))
+                self.send_header("ETag", f'"{hash(content) & 0xffffffff:x}"')
+                self.end_headers()
+                self.wfile.write(content)
+        #
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        """ Base URL """
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,45 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Stand-in metadata provider: plain HTTP GET of JSON with host rewriting """
+
+import requests  # pylint: disable=E0401
+
+from ..stand_ins import rewrite
+
+
+class Provider:  # pylint: disable=R0903
+    """ Stand-in metadata provider: plain HTTP GET of JSON with host rewriting """
+
+    def __init__(self, context, settings):
+        self.context = context
+        self.settings = settings
+        self.session = None
+
+    def init(self):
+        """ Init """
+        self.session = requests.Session()
+
+    def deinit(self):
+        """ De-init """
+        self.session.close()
+
+    def get_metadata(self, target):
+        """ Get metadata """
+        response = self.session.get(rewrite(target["source"]), timeout=10)
+        response.raise_for_status()
+        return response.json()
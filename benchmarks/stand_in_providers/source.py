@@ -0,0 +1,28 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Stand-in source provider: bootstrap HTTP source provider with host rewriting """
+
+from ..common import load_plugin_module
+from ..stand_ins import rewrite
+
+
+class Provider(load_plugin_module("tools.source").Provider):  # pylint: disable=R0903
+    """ Stand-in source provider: bootstrap HTTP source provider with host rewriting """
+
+    def get_source(self, target):
+        return super().get_source({**target, "source": rewrite(target["source"])})
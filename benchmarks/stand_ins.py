@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Benchmarks: local stand-ins for pylon runtime pieces and remote services """
+
+import types
+
+
+REWRITE = {}
+
+
+def rewrite(url):
+    """ Point known remote hosts to local stand-in server """
+    for prefix, target in REWRITE.items():
+        if url.startswith(prefix):
+            return target + url[len(prefix):]
+    #
+    return url
+
+
+def make_module(config=None):
+    """ Stand-in for bootstrap Module as seen by RepoResolver and announcer """
+    return types.SimpleNamespace(
+        context=types.SimpleNamespace(
+            id="benchmark",
+            module_manager=types.SimpleNamespace(descriptors={}),
+        ),
+        descriptor=types.SimpleNamespace(config=config or {}, loader=None),
+        memory_tracer=types.SimpleNamespace(last=None, tracing=False),
+        timeline=None,
+        sampler=None,
+        blocking_monitor=None,
+        log_buffer=[],
+    )
@@ -22,258 +22,305 @@ import logging
 from pylon.core.tools import log, web, profiling  # pylint: disable=E0611,E0401
 
 from ..tools.logs import LocalListLogHandler
+from ..tools.pycache import get_plugin_paths, invalidate_pycache, start_precompile
 from ..tools.tasks import wait_for_tasks
+from ..tools.update import UpdateTransaction
+from ..tools.sampler import StackSampler
 
 
-class Event:  # pylint: disable=R0903,E1101
-    """ Event """
-
-    @web.event("bootstrap_runtime_update")
-    def _bootstrap_runtime_update(self, context, event, payload):  # pylint: disable=R0914,R0912,R0915
-        _ = context, event
-        #
-        if not isinstance(payload, dict):
-            return
-        #
-        if self.context.id != payload.get("pylon_id", ""):
-            return
-        #
-        module_manager = self.context.module_manager
-        plugins_provider = module_manager.providers["plugins"]
-        requirements_provider = module_manager.providers["requirements"]
-        repo_resolver = self.repo_resolver
-        #
-        pycache_path = self.context.settings.get(
-            "modules", {}
-        ).get(
-            "plugins", {}
-        ).get(
-            "pycache", None
+def apply_runtime_update(self, payload):  # pylint: disable=R0914,R0912,R0915
+    """ Apply (coalesced) bootstrap_runtime_update payload """
+    module_manager = self.context.module_manager
+    requirements_provider = module_manager.providers["requirements"]
+    #
+    pycache_path = self.context.settings.get(
+        "modules", {}
+    ).get(
+        "plugins", {}
+    ).get(
+        "pycache", None
+    )
+    #
+    def _delete_pycache(plugin, source=True):
+        invalidate_pycache(
+            pycache_path,
+            get_plugin_paths(module_manager, plugin, source=source),
         )
+    #
+    transaction = UpdateTransaction(self)
+    #
+    plugin_operations = {}
+    for plugin in payload.get("plugins", []):
+        if plugin.startswith("!"):
+            plugin_operations[plugin.lstrip("!")] = "delete"
+        else:
+            plugin_operations[plugin] = "install"
+    #
+    for plugin, operation in plugin_operations.items():
+        if operation == "delete":
+            transaction.stage_delete(plugin)
+    #
+    transaction.stage_plugins(
+        [plugin for plugin, operation in plugin_operations.items() if operation == "install"],
+        resolve_dependencies=payload.get("resolve_dependencies", True),
+        workers=self.descriptor.config.get("update_workers", 4),
+    )
+    #
+    for plugin, config in payload.get("configs", {}).items():
+        transaction.stage_config(plugin, config.encode())
+    #
+    update_plan = transaction.get_plan()
+    log.info("Runtime update plan: %s", update_plan)
+    #
+    dry_run = payload.get("dry_run", False)
+    #
+    if dry_run:
+        update_ok = transaction.validate()
+        transaction.cleanup()
+    else:
+        update_ok = transaction.run()
+    #
+    restart_reasons = transaction.get_restart_reasons(
+        payload.get("actions", []), payload.get("restart_exempt", None),
+    )
+    #
+    restart_needed = payload.get("restart", "auto")
+    if restart_needed == "auto":
+        restart_needed = bool(restart_reasons)
+    #
+    self.context.event_manager.fire_event(
+        "bootstrap_runtime_update_plan",
+        {
+            "pylon_id": self.context.id,
+            "plan": update_plan,
+            "errors": list(transaction.errors),
+            "dry_run": dry_run,
+            "applied": update_ok and not dry_run,
+            "restart_required": bool(restart_reasons),
+            "restart_reasons": restart_reasons,
+            "restart": bool(restart_needed) and update_ok,
+        },
+    )
+    #
+    if dry_run:
+        log.info("Dry run, restart required: %s", bool(restart_reasons))
+        return
+    #
+    if not update_ok:
+        log.error("Runtime update aborted, installed plugins and configs are unchanged")
+        return
+    #
+    for plugin in transaction.deleted_plugins:
+        _delete_pycache(plugin)
+    #
+    precompile_thread = None
+    #
+    if restart_needed and \
+            payload.get("precompile", self.descriptor.config.get("update_precompile", False)):
+        precompile_thread = start_precompile(
+            [
+                path
+                for plugin in transaction.staged_plugins
+                for path in get_plugin_paths(module_manager, plugin, site=False)
+            ],
+            workers=self.descriptor.config.get("update_precompile_workers", 1),
+        )
+    #
+    for action in payload.get("actions", []):
+        data = None
         #
-        def _delete_pycache():
-            if pycache_path is not None:
-                import os  # pylint: disable=C0415
-                import shutil  # pylint: disable=C0415
-                #
-                try:
-                    if os.path.isdir(pycache_path):
-                        shutil.rmtree(pycache_path)
-                    else:
-                        os.remove(pycache_path)
-                except:  # pylint: disable=W0702
-                    pass
+        if not isinstance(action, str):
+            action, data = action
         #
-        for plugin in payload.get("plugins", []):
-            if plugin.startswith("!"):
-                plugin = plugin.lstrip("!")
-                log.info("Deleting plugin: %s", plugin)
-                #
-                if plugins_provider.plugin_exists(plugin):
-                    plugins_provider.delete_plugin(plugin)
-                #
-                requirements_provider.delete_requirements(plugin)
-                #
-                _delete_pycache()
-                #
-                try:
-                    from pylon.core.tools.module import state  # pylint: disable=E0611,E0401,C0415
-                    #
-                    plugin_state = state.get(plugin)
-                    plugin_state["installed"] = False
-                    state.set(plugin, plugin_state)
-                except:  # pylint: disable=W0702
-                    pass
-            else:
-                if plugins_provider.plugin_exists(plugin):
-                    log.info("Updating plugin: %s", plugin)
-                else:
-                    log.info("Installing plugin: %s", plugin)
-                #
-                plugin_info = repo_resolver.resolve(plugin)
-                #
-                if plugin_info is None:
-                    log.error("Plugin is not known by repo resolver(s)")
-                    continue
-                #
-                metadata_provider = repo_resolver.get_metadata_provider(plugin)
-                #
-                metadata_url = plugin_info["objects"]["metadata"]
-                metadata = metadata_provider.get_metadata({"source": metadata_url})
-                #
-                source_target = plugin_info["source"].copy()
-                source_type = source_target.pop("type")
-                #
-                if source_type not in ["git", "http_tar", "http_zip"]:
-                    log.error("Plugin source type is not supported: %s", source_type)
-                    continue
-                #
-                source_provider = repo_resolver.get_source_provider(plugin)
-                source = source_provider.get_source(source_target)
-                #
-                plugins_provider.add_plugin(plugin, source)
+        if action == "enable_debug_mode":
+            log.info("Enabling debug mode")
+            #
+            if self.log_handler is None:  # pylint: disable=E0203
+                logging.root.setLevel(logging.DEBUG)
                 #
-                try:
-                    from pylon.core.tools.module import state  # pylint: disable=E0611,E0401,C0415
-                    #
-                    plugin_state = state.get(plugin)
-                    plugin_state["installed"] = False
-                    state.set(plugin, plugin_state)
-                except:  # pylint: disable=W0702
-                    pass
+                self.log_handler = LocalListLogHandler(  # pylint: disable=W0201
+                    target_list=self.log_buffer,  # pylint: disable=E0203
+                )
+                self.log_handler.setFormatter(log.state.formatter)
                 #
-                log.info("Plugin updated to version %s", metadata.get("version", "0.0.0"))
+                logging.getLogger("").addHandler(self.log_handler)
         #
-        for plugin, config in payload.get("configs", {}).items():
-            log.info("Updating config: %s", plugin)
-            config_data = config.encode()
-            #
-            module_manager.providers["config"].add_config_data(plugin, config_data)
+        elif action == "disable_debug_mode":
+            log.info("Disabling debug mode")
             #
-            if plugin in module_manager.descriptors:
-                descriptor = module_manager.descriptors[plugin]
-                descriptor.load_config()
+            if self.log_handler is not None:  # pylint: disable=E0203
+                logging.getLogger("").removeHandler(self.log_handler)
                 #
-                try:
-                    if descriptor.module is not None:
-                        descriptor.module.reconfig()
-                except:  # pylint: disable=W0702
-                    pass
+                self.log_handler.flush()
+                self.log_handler.close()
+                self.log_handler = None  # pylint: disable=W0201
+                #
+                logging.root.setLevel(logging.INFO)
+                #
+                self.log_buffer = []  # pylint: disable=W0201
         #
-        for action in payload.get("actions", []):
-            if not isinstance(action, str):
-                action, data = action
+        elif action == "enable_profiling":
+            profiling_config = {
+                **self.descriptor.config.get("sampling_profiler", {}),
+                **(data if isinstance(data, dict) else {}),
+            }
             #
-            if action == "enable_debug_mode":
-                log.info("Enabling debug mode")
+            if profiling_config.get("mode", "ondemand") == "sampling":
+                log.info("Enabling sampling profiler")
                 #
-                if self.log_handler is None:  # pylint: disable=E0203
-                    logging.root.setLevel(logging.DEBUG)
-                    #
-                    self.log_handler = LocalListLogHandler(  # pylint: disable=W0201
-                        target_list=self.log_buffer,  # pylint: disable=E0203
+                if self.sampler is None or not self.sampler.running:  # pylint: disable=E0203
+                    self.sampler = StackSampler(  # pylint: disable=W0201
+                        hz=profiling_config.get("hz", 50),
+                        max_stacks=profiling_config.get("max_stacks", 10000),
+                        max_depth=profiling_config.get("max_depth", 64),
                     )
-                    self.log_handler.setFormatter(log.state.formatter)
-                    #
-                    logging.getLogger("").addHandler(self.log_handler)
-            #
-            elif action == "disable_debug_mode":
-                log.info("Disabling debug mode")
+                    self.sampler.start()
                 #
-                if self.log_handler is not None:  # pylint: disable=E0203
-                    logging.getLogger("").removeHandler(self.log_handler)
-                    #
-                    self.log_handler.flush()
-                    self.log_handler.close()
-                    self.log_handler = None  # pylint: disable=W0201
-                    #
-                    logging.root.setLevel(logging.INFO)
-                    #
-                    self.log_buffer = []  # pylint: disable=W0201
+                continue
             #
-            elif action == "enable_profiling":
-                log.info("Enabling profiling")
-                #
-                if "stage" not in self.context.profiling:
-                    self.context.profiling["stage"] = {}
-                #
-                self.context.profiling["stage"]["ondemand"] = True
-                profiling.profiling_start(self.context, "ondemand")
+            log.info("Enabling profiling")
             #
-            elif action == "disable_profiling":
-                log.info("Disabling profiling")
-                #
-                if self.context.profiling.get("stage", {}).get("ondemand", False):
-                    profiling.profiling_stop(self.context, "ondemand")
-                    self.context.profiling["stage"]["ondemand"] = False
+            if "stage" not in self.context.profiling:
+                self.context.profiling["stage"] = {}
             #
-            elif action == "enable_splash":
-                log.info("Enabling maintenance splash")
-                #
-                try:
-                    self.descriptor.state["splash_enabled"] = True
-                    self.descriptor.save_state()
-                except:  # pylint: disable=W0702
-                    log.exception("Skipping state exception")
-                #
-                if self.context.web_runtime == "gevent":
-                    from ..tools.splash import maintenance_splash_hook  # pylint: disable=C0415
-                    #
-                    try:
-                        if maintenance_splash_hook not in self.context.root_router.hooks:
-                            self.context.root_router.hooks.append(maintenance_splash_hook)
-                    except:  # pylint: disable=W0702
-                        log.exception("Skipping exception")
+            self.context.profiling["stage"]["ondemand"] = True
+            profiling.profiling_start(self.context, "ondemand")
+        #
+        elif action == "disable_profiling":
+            log.info("Disabling profiling")
+            #
+            if self.sampler is not None:
+                self.sampler.stop()
+            #
+            if self.context.profiling.get("stage", {}).get("ondemand", False):
+                profiling.profiling_stop(self.context, "ondemand")
+                self.context.profiling["stage"]["ondemand"] = False
+        #
+        elif action == "enable_memory_tracing":
+            frames = data.get("frames", 1) if isinstance(data, dict) else 1
+            self.memory_tracer.start(frames)
+        #
+        elif action == "sample_memory":
+            self.memory_tracer.sample()
+        #
+        elif action == "disable_memory_tracing":
+            self.memory_tracer.stop()
+        #
+        elif action == "enable_splash":
+            log.info("Enabling maintenance splash")
             #
-            elif action == "disable_splash":
-                log.info("Disabling maintenance splash")
+            try:
+                self.descriptor.state["splash_enabled"] = True
+                self.descriptor.save_state()
+            except:  # pylint: disable=W0702
+                log.exception("Skipping state exception")
+            #
+            if self.context.web_runtime == "gevent":
+                from ..tools.splash import maintenance_splash_hook  # pylint: disable=C0415
                 #
                 try:
-                    self.descriptor.state["splash_enabled"] = False
-                    self.descriptor.save_state()
+                    if maintenance_splash_hook not in self.context.root_router.hooks:
+                        self.context.root_router.hooks.append(maintenance_splash_hook)
                 except:  # pylint: disable=W0702
-                    log.exception("Skipping state exception")
-                #
-                if self.context.web_runtime == "gevent":
-                    from ..tools.splash import maintenance_splash_hook  # pylint: disable=C0415
-                    #
-                    try:
-                        if maintenance_splash_hook in self.context.root_router.hooks:
-                            self.context.root_router.hooks.remove(maintenance_splash_hook)
-                    except:  # pylint: disable=W0702
-                        log.exception("Skipping exception")
+                    log.exception("Skipping exception")
+        #
+        elif action == "disable_splash":
+            log.info("Disabling maintenance splash")
             #
-            elif action == "delete_requirements":
-                for plugin in data:
-                    log.info("Deleting requirements: %s", plugin)
-                    #
-                    requirements_provider.delete_requirements(plugin)
-                    #
-                    _delete_pycache()
+            try:
+                self.descriptor.state["splash_enabled"] = False
+                self.descriptor.save_state()
+            except:  # pylint: disable=W0702
+                log.exception("Skipping state exception")
             #
-            elif action == "update_pylon_config":
-                log.info("Updating pylon config")
+            if self.context.web_runtime == "gevent":
+                from ..tools.splash import maintenance_splash_hook  # pylint: disable=C0415
                 #
                 try:
-                    from pylon.core.tools import config  # pylint: disable=E0611,E0401,C0415
-                    #
-                    encoded_data = data.encode()
-                    config.tunable_set("pylon_settings", encoded_data)
-                    self.context.settings_data = encoded_data
+                    if maintenance_splash_hook in self.context.root_router.hooks:
+                        self.context.root_router.hooks.remove(maintenance_splash_hook)
                 except:  # pylint: disable=W0702
                     log.exception("Skipping exception")
         #
-        reload_plugins = payload.get("reload", [])
-        #
-        if reload_plugins:
-            for plugin in module_manager.load_order:
-                if plugin in reload_plugins:
-                    log.info("Requesting plugin reload: %s", plugin)
-                    #
-                    self.context.manager.reload_plugin(plugin)
-            #
-            log.info("All reloads done")
+        elif action == "delete_requirements":
+            for plugin in data:
+                log.info("Deleting requirements: %s", plugin)
+                #
+                _delete_pycache(plugin, source=False)
+                #
+                requirements_provider.delete_requirements(plugin)
         #
-        if payload.get("restart", True):
-            try:
-                wait_for_tasks(self)
-            except:  # pylint: disable=W0702
-                pass
+        elif action == "update_pylon_config":
+            log.info("Updating pylon config")
             #
             try:
-                from pylon.core.tools.server import restart
-            except:  # pylint: disable=W0702
-                log.exception("Failed to import server restart, using bootstrap fallback")
-                #
-                import os  # pylint: disable=C0415
-                import subprocess  # pylint: disable=C0415
+                from pylon.core.tools import config  # pylint: disable=E0611,E0401,C0415
                 #
-                pylon_pid = payload.get("pylon_pid", os.getpid())
+                encoded_data = data.encode()
+                config.tunable_set("pylon_settings", encoded_data)
+                self.context.settings_data = encoded_data
+            except:  # pylint: disable=W0702
+                log.exception("Skipping exception")
+    #
+    reload_plugins = payload.get("reload", [])
+    #
+    if reload_plugins:
+        for plugin in module_manager.load_order:
+            if plugin in reload_plugins:
+                log.info("Requesting plugin reload: %s", plugin)
                 #
-                log.info("Restarting pylon (pid = %s)", pylon_pid)
-                subprocess.Popen(  # pylint: disable=R1732
-                        ["/bin/bash", "-c", f"bash -c 'sleep 1; kill {pylon_pid}' &"]
-                )
-            else:
-                log.info("Restarting via server restart")
-                restart()
+                self.context.manager.reload_plugin(plugin)
+        #
+        log.info("All reloads done")
+    #
+    if not restart_needed:
+        log.info("All changes applied in place, skipping restart")
+    else:
+        log.info("Restart reasons: %s", restart_reasons or ["requested"])
+        #
+        try:
+            wait_for_tasks(self)
+        except:  # pylint: disable=W0702
+            pass
+        #
+        if precompile_thread is not None:
+            log.info("Waiting for precompile to finish")
+            precompile_thread.join()
+        #
+        try:
+            from pylon.core.tools.server import restart
+        except:  # pylint: disable=W0702
+            log.exception("Failed to import server restart, using bootstrap fallback")
+            #
+            import os  # pylint: disable=C0415
+            import subprocess  # pylint: disable=C0415
+            #
+            pylon_pid = payload.get("pylon_pid", os.getpid())
+            #
+            log.info("Restarting pylon (pid = %s)", pylon_pid)
+            subprocess.Popen(  # pylint: disable=R1732
+                    ["/bin/bash", "-c", f"bash -c 'sleep 1; kill {pylon_pid}' &"]
+            )
+        else:
+            log.info("Restarting via server restart")
+            restart()
+
+
+class Event:  # pylint: disable=R0903,E1101
+    """ Event """
+
+    @web.event("bootstrap_runtime_update")
+    def _bootstrap_runtime_update(self, context, event, payload):
+        _ = context, event
+        #
+        if not isinstance(payload, dict):
+            return
+        #
+        if self.context.id != payload.get("pylon_id", ""):
+            return
+        #
+        if self.update_coalescer is None:
+            apply_runtime_update(self, payload)
+            return
+        #
+        self.update_coalescer.submit(payload)
@@ -18,28 +18,44 @@
 
 """ Module """
 
-import os
 import time
-import signal
-import zipfile
-import tarfile
-import logging
-import tempfile
-import threading
-import faulthandler
 
-import arbiter  # pylint: disable=E0401
-import requests  # pylint: disable=E0401
+MODULE_IMPORT_STARTED = time.perf_counter()
 
-from pylon.core.tools import log  # pylint: disable=E0611,E0401
-from pylon.core.tools import module  # pylint: disable=E0611,E0401
+import os  # pylint: disable=C0411,C0413
+import shutil  # pylint: disable=C0411,C0413
+import signal  # pylint: disable=C0411,C0413
+import functools  # pylint: disable=C0411,C0413
+import logging  # pylint: disable=C0411,C0413
+import threading  # pylint: disable=C0411,C0413
+import faulthandler  # pylint: disable=C0411,C0413
 
-from .tools.repo import RepoResolver
-from .tools.event import RuntimeAnnoucer
-from .tools.logs import LocalListLogHandler
-from .tools.signal import signal_sigusr2
-from .tools.tasks import wait_for_tasks
-from .tools import mesh
+from pylon.core.tools import log  # pylint: disable=E0611,E0401,C0413
+from pylon.core.tools import module  # pylint: disable=E0611,E0401,C0413
+
+from .tools.repo import RepoResolver  # pylint: disable=C0413
+from .tools.lock import tree_digest, load_lockfile, save_lockfile  # pylint: disable=C0413
+from .tools.event import RuntimeAnnoucer  # pylint: disable=C0413
+from .tools.logs import LocalListLogHandler  # pylint: disable=C0413
+from .tools.tasks import wait_for_tasks  # pylint: disable=C0413
+from .tools.update import UpdateCoalescer  # pylint: disable=C0413
+from .tools.retry import get_policy, is_transient_error, CircuitOpenError  # pylint: disable=C0413
+from .tools.timeline import BootTimeline, get_tree_size  # pylint: disable=C0413
+from .tools.metrics import registry  # pylint: disable=C0413
+from .tools.memory import MemoryTracer  # pylint: disable=C0413
+from .tools.scheduler import scheduler, PRIORITY_PRELOAD, PRIORITY_BUNDLE  # pylint: disable=C0413
+from .tools.imports import timed_import, record_import_time, log_import_report  # pylint: disable=C0413
+
+
+bundle_extract_seconds = registry.histogram(
+    "bootstrap_bundle_extract_seconds", "Bundle extraction time",
+)
+
+
+def apply_runtime_update(self, payload):
+    """ Apply runtime update (runtime update machinery is imported on first use) """
+    runtime = timed_import(".events.runtime", __package__)
+    return runtime.apply_runtime_update(self, payload)
 
 
 class Module(module.ModuleModel):  # pylint: disable=R0902
@@ -54,56 +70,390 @@ class Module(module.ModuleModel):  # pylint: disable=R0902
         #
         self.mesh_event_node = None
         self.mesh_service_node = None
+        self.mesh_mirror = None
+        self.mesh_services = []
         #
         self.repo_resolver = None
+        self.resolver_engine = None
+        self.prefetched = {}
+        self.preload_order = {}
+        self.preloaded_plugins = None
+        #
+        self.db_engines = {}
+        self.db_engines_lock = threading.Lock()
+        self.db_token_cache = None
         #
         self.stop_event = threading.Event()
         self.announcer = None
+        self.update_coalescer = None
+        #
+        self.timeline = BootTimeline()
+        self.sampler = None
+        self.blocking_monitor = None
+        self.memory_tracer = MemoryTracer(self)
+        #
+        self.drain_status = {
+            "state": "idle",
+            "started": None,
+            "finished": None,
+            "waiting": [],
+        }
 
     def preload(self):
         """ Preload handler """
-        self.repo_resolver = self._make_resolver()
-        self.repo_resolver.init()
+        with self.timeline.phase("preload"):
+            scheduler.configure(self.descriptor.config.get("download_scheduler", {}))
+            #
+            with self.timeline.phase("resolver_init"):
+                self.repo_resolver = self._make_resolver()
+                self.repo_resolver.init()
+            #
+            mesh_config = self.descriptor.config.get("mesh", {})
+            if mesh_config.get("mirror", {}).get("use", False):
+                self._init_mesh(mesh_config)
+            #
+            self.resolver_engine = self._get_resolver_engine()
+            #
+            try:
+                self._preload_plugins()
+            finally:
+                self.prefetched.clear()
+
+    def _get_resolver_engine(self):
+        engine_config = self.descriptor.config.get("resolver_engine", {})
+        #
+        if engine_config.get("type", "blocking") != "cooperative":
+            return None
+        #
+        if self.descriptor.config.get("mesh", {}).get("mirror", {}).get("use", False):
+            log.info("Mesh mirror is used, cooperative resolver engine is disabled")
+            return None
+        #
+        engine = timed_import(".tools.engine", __package__)
+        result = engine.CooperativeEngine(engine_config, self.timeline)
         #
-        plugins_to_check = [
+        log.info("Using cooperative resolver engine (%s)", result.mode)
+        return result
+
+    def _get_preordered_plugins(self):
+        return [
             *self.descriptor.config.get("local_preordered_plugins", []),
             *self.descriptor.config.get("customer_preordered_plugins", []),
             *self.descriptor.config.get("preordered_plugins", [])
         ]
+
+    def _get_plugin_path(self, plugin):
+        plugins_path = getattr(
+            self.context.module_manager.providers["plugins"], "path", None,
+        )
         #
-        known_plugins = set(plugins_to_check)
+        if plugins_path is None:
+            return None
+        #
+        return os.path.join(plugins_path, plugin)
+
+    def _preload_plugin(self, plugin, lock_entry=None, with_digest=False):  # pylint: disable=R0911
+        """ Ensure plugin is present, return (metadata, lock_entry) """
         plugins_provider = self.context.module_manager.providers["plugins"]
         #
-        while plugins_to_check:
-            plugin = plugins_to_check.pop(0)
-            log.info("Preloading plugin: %s", plugin)
+        def _digest():
+            if not with_digest:
+                return None
             #
-            if plugins_provider.plugin_exists(plugin):
-                log.info("Plugin %s already exists", plugin)
+            return tree_digest(self._get_plugin_path(plugin))
+        #
+        def _local_entry(metadata):
+            # Source fields are kept only while they still produce the installed tree
+            digest = _digest()
+            result = {
+                "repo": None,
+                "source": None,
+                "metadata_url": None,
+            }
+            #
+            if lock_entry is not None and digest is not None and \
+                    lock_entry.get("digest", None) == digest:
+                result.update(lock_entry)
+            #
+            result["version"] = metadata.get("version", "0.0.0")
+            result["depends_on"] = metadata.get("depends_on", [])
+            result["digest"] = digest
+            #
+            return result
+        #
+        if plugins_provider.plugin_exists(plugin):
+            log.info("Plugin %s already exists", plugin)
+            #
+            metadata = plugins_provider.get_plugin_metadata(plugin)
+            #
+            result_entry = _local_entry(metadata)
+            #
+            return metadata, result_entry
+        #
+        mirror_config = self.descriptor.config.get("mesh", {}).get("mirror", {})
+        #
+        if mirror_config.get("use", False) and self.mesh_service_node is not None:
+            mirror = timed_import(".tools.mirror", __package__)
+            #
+            with self.timeline.phase("mirror_fetch", plugin) as phase:
+                metadata, source = mirror.fetch_from_mirror(
+                    self.mesh_service_node, mirror_config, plugin,
+                )
+                phase["bytes"] = get_tree_size(source)
+            #
+            if metadata is not None:
+                try:
+                    with self.timeline.phase("install", plugin):
+                        plugins_provider.add_plugin(plugin, source)
+                finally:
+                    shutil.rmtree(source, ignore_errors=True)
                 #
-                metadata = plugins_provider.get_plugin_metadata(plugin)
-            else:
-                plugin_info = self.repo_resolver.resolve(plugin)
-                if plugin_info is None:
+                result_entry = _local_entry(metadata)
+                #
+                return metadata, result_entry
+        #
+        prefetched = self.prefetched.pop(plugin, {})
+        #
+        if "metadata" in prefetched:
+            resolver = prefetched["resolver"]
+            plugin_info = prefetched["plugin_info"]
+            metadata = prefetched["metadata"]
+            metadata_url = plugin_info["objects"]["metadata"]
+        else:
+            with self.timeline.phase("resolve", plugin):
+                found = self.repo_resolver.find(plugin)
+                if found is None:
                     log.error("Plugin %s is not known", plugin)
-                    continue
+                    return None, None
                 #
-                metadata_provider = self.repo_resolver.get_metadata_provider(plugin)
+                resolver, plugin_info = found
                 #
                 metadata_url = plugin_info["objects"]["metadata"]
-                metadata = metadata_provider.get_metadata({"source": metadata_url})
+                metadata = resolver.metadata_provider.get_metadata({"source": metadata_url})
+        #
+        source_target = plugin_info["source"].copy()
+        source_type = source_target.pop("type")
+        #
+        if source_type not in  ["git", "http_tar", "http_zip"]:
+            log.error("Plugin %s source type %s is not supported", plugin, source_type)
+            return None, None
+        #
+        source = prefetched.get("source", None)
+        if source is None:
+            source = self._fetch_plugin_source(plugin, resolver, source_target)
+        #
+        with self.timeline.phase("install", plugin):
+            plugins_provider.add_plugin(plugin, source)
+        #
+        result_entry = {
+            "repo": resolver.repo_id,
+            "source": plugin_info["source"],
+            "metadata_url": metadata_url,
+            "version": metadata.get("version", "0.0.0"),
+            "depends_on": metadata.get("depends_on", []),
+            "digest": _digest(),
+        }
+        #
+        return metadata, result_entry
+
+    @staticmethod
+    def _warn_unverified_digest(plugin, resolver, source_target):
+        if source_target.get("digest", None) is not None and \
+                not getattr(resolver.source_provider, "verifies_digest", False):
+            log.warning(
+                "Plugin %s: source digest is not verified by %s (use resumable_downloads)",
+                plugin, type(resolver.source_provider).__module__,
+            )
+
+    def _fetch_plugin_source(self, plugin, resolver, source_target):
+        self._warn_unverified_digest(plugin, resolver, source_target)
+        #
+        with scheduler.slot(
+                source_target.get("source", None),
+                PRIORITY_PRELOAD + self.preload_order.get(plugin, 0),
+        ):
+            with self.timeline.phase("download", plugin) as phase:
+                source = resolver.source_provider.get_source(source_target)
+                phase["bytes"] = get_tree_size(source)
+        #
+        return source
+
+    def _prefetch_plugins(self, plugins, lock_entries):
+        """ Resolve and download queued plugins concurrently, results go to self.prefetched """
+        plugins_provider = self.context.module_manager.providers["plugins"]
+        #
+        to_resolve = []
+        downloads = []
+        #
+        for plugin in plugins:
+            if plugin in self.prefetched or plugins_provider.plugin_exists(plugin):
+                continue
+            #
+            lock_entry = lock_entries.get(plugin, None)
+            #
+            if lock_entry is None:
+                to_resolve.append(plugin)
+                continue
+            #
+            resolver = None
+            if lock_entry.get("repo", None) is not None:
+                resolver = self.repo_resolver.get_resolver(lock_entry["repo"])
+            #
+            if resolver is None or resolver.source_provider is None or \
+                    lock_entry.get("source", None) is None:
+                continue  # resolved sequentially by _preload_locked_plugin
+            #
+            source_target = lock_entry["source"].copy()
+            source_target.pop("type")
+            #
+            downloads.append((plugin, resolver, source_target))
+        #
+        with self.timeline.phase("prefetch"):
+            found = self.resolver_engine.find(self.repo_resolver, to_resolve)
+            metadata = self.resolver_engine.get_metadata(found)
+            #
+            for plugin, (resolver, plugin_info) in found.items():
+                if plugin not in metadata:
+                    continue
+                #
+                self.prefetched[plugin] = {
+                    "resolver": resolver,
+                    "plugin_info": plugin_info,
+                    "metadata": metadata[plugin],
+                }
                 #
                 source_target = plugin_info["source"].copy()
                 source_type = source_target.pop("type")
                 #
-                if source_type not in  ["git", "http_tar", "http_zip"]:
-                    log.error("Plugin %s source type %s is not supported", plugin, source_type)
-                    continue
+                if source_type in ["git", "http_tar", "http_zip"]:
+                    downloads.append((plugin, resolver, source_target))
+            #
+            for plugin, resolver, source_target in downloads:
+                self._warn_unverified_digest(plugin, resolver, source_target)
+            #
+            sources = self.resolver_engine.get_sources(downloads, {
+                plugin: PRIORITY_PRELOAD + self.preload_order.get(plugin, 0)
+                for plugin, _, _ in downloads
+            })
+            #
+            for plugin, source in sources.items():
+                self.prefetched.setdefault(plugin, {})["source"] = source
+        #
+        log.info(
+            "Prefetched plugins: %s resolved, %s downloaded", len(found), len(sources),
+        )
+
+    def _preload_locked_plugin(self, plugin, lock_entry, allow_mismatch=False):
+        """ Ensure plugin matches lockfile without metadata calls """
+        plugins_provider = self.context.module_manager.providers["plugins"]
+        plugin_path = self._get_plugin_path(plugin)
+        #
+        if plugins_provider.plugin_exists(plugin) and \
+                tree_digest(plugin_path) == lock_entry.get("digest", None):
+            log.info("Plugin %s matches lockfile", plugin)
+            return {
+                "version": lock_entry.get("version", "0.0.0"),
+                "depends_on": lock_entry.get("depends_on", []),
+            }, lock_entry
+        #
+        resolver = None
+        if lock_entry.get("repo", None) is not None:
+            resolver = self.repo_resolver.get_resolver(lock_entry["repo"])
+        #
+        if resolver is None or resolver.source_provider is None or \
+                lock_entry.get("source", None) is None:
+            log.warning("Plugin %s: lockfile has no usable source, resolving", plugin)
+            return self._preload_plugin(plugin, with_digest=True)
+        #
+        log.info("Fetching locked plugin: %s", plugin)
+        #
+        source_target = lock_entry["source"].copy()
+        source_target.pop("type")
+        #
+        source = self.prefetched.pop(plugin, {}).get("source", None)
+        if source is None:
+            source = self._fetch_plugin_source(plugin, resolver, source_target)
+        #
+        # Verify staged source before it replaces anything
+        #
+        digest = tree_digest(source)
+        if digest != lock_entry.get("digest", None):
+            if not allow_mismatch:
+                log.error(
+                    "Plugin %s digest mismatch: locked %s, fetched %s, not installing",
+                    plugin, lock_entry.get("digest", None), digest,
+                )
                 #
-                source_provider = self.repo_resolver.get_source_provider(plugin)
+                if plugins_provider.plugin_exists(plugin):
+                    log.warning("Keeping existing local copy of plugin %s", plugin)
+                    return plugins_provider.get_plugin_metadata(plugin), lock_entry
                 #
-                source = source_provider.get_source(source_target)
-                plugins_provider.add_plugin(plugin, source)
+                return None, None
+            #
+            log.warning(
+                "Plugin %s digest mismatch: locked %s, fetched %s (allowed by config)",
+                plugin, lock_entry.get("digest", None), digest,
+            )
+        #
+        with self.timeline.phase("install", plugin):
+            plugins_provider.add_plugin(plugin, source)
+        #
+        return {
+            "version": lock_entry.get("version", "0.0.0"),
+            "depends_on": lock_entry.get("depends_on", []),
+        }, lock_entry
+
+    def _preload_plugins(self):  # pylint: disable=R0912
+        lock_config = self.descriptor.config.get("resolution_lock", {})
+        lock_path = None
+        lock_data = None
+        locked = False
+        #
+        if isinstance(lock_config, dict) and lock_config.get("enabled", False):
+            lock_path = lock_config.get("path", None)
+            #
+            if lock_path is None:
+                log.error("Lockfile path is not set, resolution lock is disabled")
+            else:
+                lock_data = load_lockfile(lock_path)
+                locked = lock_config.get("locked", False) and lock_data is not None
+        #
+        lock_entries = lock_data.get("plugins", {}) if lock_data is not None else {}
+        new_lock_entries = {}
+        resolved_ok = True
+        #
+        plugins_to_check = self._get_preordered_plugins()
+        #
+        known_plugins = set(plugins_to_check)
+        #
+        self.preload_order = {plugin: idx for idx, plugin in enumerate(plugins_to_check)}
+        self.preloaded_plugins = {}
+        prefetch_attempted = set()
+        #
+        while plugins_to_check:
+            if self.resolver_engine is not None and plugins_to_check[0] not in prefetch_attempted:
+                self._prefetch_plugins(plugins_to_check, lock_entries if locked else {})
+                prefetch_attempted.update(plugins_to_check)
+            #
+            plugin = plugins_to_check.pop(0)
+            log.info("Preloading plugin: %s", plugin)
+            #
+            if locked and plugin in lock_entries:
+                metadata, lock_entry = self._preload_locked_plugin(
+                    plugin, lock_entries[plugin],
+                    allow_mismatch=lock_config.get("allow_digest_mismatch", False),
+                )
+            else:
+                metadata, lock_entry = self._preload_plugin(
+                    plugin, lock_entries.get(plugin, None), with_digest=lock_path is not None,
+                )
+            #
+            if metadata is None:
+                resolved_ok = False
+                continue
+            #
+            self.preloaded_plugins[plugin] = metadata
+            new_lock_entries[plugin] = lock_entry
             #
             for dependency in metadata.get("depends_on", []):
                 if dependency in known_plugins:
@@ -111,15 +461,72 @@ class Module(module.ModuleModel):  # pylint: disable=R0902
                 #
                 known_plugins.add(dependency)
                 plugins_to_check.append(dependency)
+                self.preload_order[dependency] = len(self.preload_order)
+        #
+        if lock_path is not None:
+            if locked:
+                if new_lock_entries != lock_entries:
+                    log.warning("Resolution differs from locked lockfile, not updating lockfile")
+            elif not resolved_ok:
+                log.warning("Resolution incomplete, not updating lockfile")
+            elif new_lock_entries != lock_entries:
+                try:
+                    save_lockfile(lock_path, new_lock_entries)
+                except:  # pylint: disable=W0702
+                    log.exception("Failed to save lockfile")
 
-    def init(self):  # pylint: disable=R0914
+    def _check_preloaded_plugins(self):
+        if self.preloaded_plugins is None:
+            return False
+        #
+        plugins_provider = self.context.module_manager.providers["plugins"]
+        #
+        for plugin in self._get_preordered_plugins():
+            if plugin not in self.preloaded_plugins:
+                return False
+        #
+        for plugin in self.preloaded_plugins:
+            if not plugins_provider.plugin_exists(plugin):
+                return False
+        #
+        return True
+
+    def init(self):
         """ Init module """
+        try:
+            with self.timeline.phase("init"):
+                self._init()
+        finally:
+            self.prefetched.clear()
+            #
+            if self.repo_resolver is not None:
+                self.repo_resolver.clear_cache()
+        #
+        self.timeline.log_summary()
+        log_import_report()
+
+    def _init(self):  # pylint: disable=R0914
         log.info("Initializing module")
         #
         faulthandler.register(signum=signal.SIGUSR1)  # pylint: disable=E1101
         #
         if self.context.web_runtime == "gevent":
-            signal.signal(signal.SIGUSR2, signal_sigusr2)  # pylint: disable=E1101
+            diagnostics = timed_import(".tools.signal", __package__)
+            #
+            signal.signal(  # pylint: disable=E1101
+                signal.SIGUSR2,  # pylint: disable=E1101
+                functools.partial(diagnostics.signal_sigusr2, module=self),
+            )
+            #
+            blocking_config = self.descriptor.config.get("blocking_monitor", {})
+            if isinstance(blocking_config, dict) and blocking_config.get("enabled", False):
+                blocking = timed_import(".tools.blocking", __package__)
+                #
+                self.blocking_monitor = blocking.BlockingMonitor(
+                    threshold=blocking_config.get("threshold", 0.1),
+                    max_sites=blocking_config.get("max_sites", 500),
+                )
+                self.blocking_monitor.start()
         #
         if self.descriptor.config.get("debug", False):
             logging.root.setLevel(logging.DEBUG)
@@ -144,61 +551,29 @@ class Module(module.ModuleModel):  # pylint: disable=R0902
         #
         self._init_mesh(self.descriptor.config.get("mesh", {}))
         #
-        self.repo_resolver = self._make_resolver()
-        self.repo_resolver.init()
-        #
-        plugins_to_check = [
-            *self.descriptor.config.get("local_preordered_plugins", []),
-            *self.descriptor.config.get("customer_preordered_plugins", []),
-            *self.descriptor.config.get("preordered_plugins", [])
-        ]
-        #
-        known_plugins = set(plugins_to_check)
-        plugins_provider = self.context.module_manager.providers["plugins"]
+        if self.repo_resolver is None:
+            with self.timeline.phase("resolver_init"):
+                self.repo_resolver = self._make_resolver()
+                self.repo_resolver.init()
         #
-        while plugins_to_check:
-            plugin = plugins_to_check.pop(0)
-            log.info("Preloading plugin: %s", plugin)
-            #
-            if plugins_provider.plugin_exists(plugin):
-                log.info("Plugin %s already exists", plugin)
-                #
-                metadata = plugins_provider.get_plugin_metadata(plugin)
-            else:
-                plugin_info = self.repo_resolver.resolve(plugin)
-                if plugin_info is None:
-                    log.error("Plugin %s is not known", plugin)
-                    continue
-                #
-                metadata_provider = self.repo_resolver.get_metadata_provider(plugin)
-                #
-                metadata_url = plugin_info["objects"]["metadata"]
-                metadata = metadata_provider.get_metadata({"source": metadata_url})
-                #
-                source_target = plugin_info["source"].copy()
-                source_type = source_target.pop("type")
-                #
-                if source_type not in  ["git", "http_tar", "http_zip"]:
-                    log.error("Plugin %s source type %s is not supported", plugin, source_type)
-                    continue
-                #
-                source_provider = self.repo_resolver.get_source_provider(plugin)
-                #
-                source = source_provider.get_source(source_target)
-                plugins_provider.add_plugin(plugin, source)
-            #
-            for dependency in metadata.get("depends_on", []):
-                if dependency in known_plugins:
-                    continue
-                #
-                known_plugins.add(dependency)
-                plugins_to_check.append(dependency)
+        if self._check_preloaded_plugins():
+            log.info("Preordered plugins are already preloaded")
+        else:
+            try:
+                self._preload_plugins()
+            finally:
+                self.prefetched.clear()
         #
         self.descriptor.init_events()
         #
-        self.announcer = RuntimeAnnoucer(self, {})
+        self.announcer = RuntimeAnnoucer(self, self.descriptor.config.get("announcer", {}))
         self.announcer.start()
         #
+        self.update_coalescer = UpdateCoalescer(
+            self, apply_runtime_update, self.descriptor.config,
+        )
+        self.update_coalescer.start()
+        #
         autocreate_dbs = self.descriptor.config.get("autocreate_dbs", {})
         if isinstance(autocreate_dbs, dict) and autocreate_dbs.get("enabled", False):
             db_url = autocreate_dbs.get("db_url", None)
@@ -208,42 +583,106 @@ class Module(module.ModuleModel):  # pylint: disable=R0902
                 log.error("DB URL is not provided for autocreate_dbs, skipping DB auto-creation")
                 return
             #
-            for db_name in autocreate_dbs.get("db_names", []):
-                self.ensure_db(
+            with self.timeline.phase("ensure_db"):
+                self.ensure_dbs(
                     db_url=db_url,
-                    db_name=db_name,
+                    db_names=autocreate_dbs.get("db_names", []),
                     use_managed_identity=use_managed_identity,
                     mute_first_failed_connections=5,
                     connection_retry_interval=5.0,
                 )
 
+    def _get_mesh_services(self):
+        mesh = timed_import(".tools.mesh", __package__)
+        prefix = f"mesh:service:{self.context.id}"
+        #
+        return [
+            (
+                mesh.get_plugin_frozen_requirements,
+                f"{prefix}:get_plugin_frozen_requirements",
+            ),
+            (
+                mesh.get_plugins_frozen_requirements,
+                f"{prefix}:get_plugins_frozen_requirements",
+            ),
+            (
+                functools.partial(mesh.get_plugin_runtime_info, self),
+                f"{prefix}:get_plugin_runtime_info",
+            ),
+            (
+                functools.partial(mesh.get_log_tail, self),
+                f"{prefix}:get_log_tail",
+            ),
+            (
+                functools.partial(mesh.get_profiling_snapshot, self),
+                f"{prefix}:get_profiling_snapshot",
+            ),
+            (
+                functools.partial(mesh.get_sampled_profile, self),
+                f"{prefix}:get_sampled_profile",
+            ),
+            (
+                functools.partial(mesh.get_metrics, self),
+                f"{prefix}:get_metrics",
+            ),
+            (
+                functools.partial(mesh.get_memory_snapshot, self),
+                f"{prefix}:get_memory_snapshot",
+            ),
+            (
+                functools.partial(mesh.get_drain_status, self),
+                f"{prefix}:get_drain_status",
+            ),
+            (
+                functools.partial(mesh.get_download_scheduler_status, self),
+                f"{prefix}:get_download_scheduler_status",
+            ),
+            (
+                functools.partial(mesh.get_retry_metrics, self),
+                f"{prefix}:get_retry_metrics",
+            ),
+        ]
+
     def _init_mesh(self, mesh_config):
-        if "event_node" not in mesh_config:
+        if "event_node" not in mesh_config or self.mesh_service_node is not None:
             return
         #
-        self.mesh_event_node = arbiter.make_event_node(
-            config=mesh_config.get("event_node"),
-        )
-        self.mesh_event_node.start()
-        #
-        self.mesh_service_node = arbiter.ServiceNode(
-            event_node=self.mesh_event_node,
-            id_prefix=f"mesh:id:{self.context.id}:",
-            default_timeout=120,
-        )
-        self.mesh_service_node.start()
+        arbiter = timed_import("arbiter")
         #
-        self.mesh_service_node.register(
-            callback=mesh.get_plugin_frozen_requirements,
-            name=f"mesh:service:{self.context.id}:get_plugin_frozen_requirements",
-        )
+        with self.timeline.phase("mesh_init"):
+            self.mesh_event_node = arbiter.make_event_node(
+                config=mesh_config.get("event_node"),
+            )
+            self.mesh_event_node.start()
+            #
+            self.mesh_service_node = arbiter.ServiceNode(
+                event_node=self.mesh_event_node,
+                id_prefix=f"mesh:id:{self.context.id}:",
+                default_timeout=120,
+            )
+            self.mesh_service_node.start()
+            #
+            self.mesh_services = self._get_mesh_services()
+            #
+            for callback, name in self.mesh_services:
+                self.mesh_service_node.register(callback=callback, name=name)
+            #
+            mirror_config = mesh_config.get("mirror", {})
+            if mirror_config.get("serve", False):
+                log.info("Serving plugins to mesh peers")
+                #
+                mirror = timed_import(".tools.mirror", __package__)
+                #
+                self.mesh_mirror = mirror.MeshMirror(self, mirror_config)
+                self.mesh_mirror.register(self.mesh_service_node)
 
     def _deinit_mesh(self):
         if self.mesh_service_node is not None:
-            self.mesh_service_node.unregister(
-                callback=mesh.get_plugin_frozen_requirements,
-                name=f"mesh:service:{self.context.id}:get_plugin_frozen_requirements",
-            )
+            for callback, name in self.mesh_services:
+                self.mesh_service_node.unregister(callback=callback, name=name)
+            #
+            if self.mesh_mirror is not None:
+                self.mesh_mirror.unregister(self.mesh_service_node)
             #
             self.mesh_service_node.stop()
         #
@@ -266,6 +705,8 @@ class Module(module.ModuleModel):  # pylint: disable=R0902
         if self.repo_resolver is not None:
             self.repo_resolver.deinit()
         #
+        scheduler.configure(self.descriptor.config.get("download_scheduler", {}))
+        #
         self.repo_resolver = self._make_resolver()
         self.repo_resolver.init()
 
@@ -283,6 +724,17 @@ class Module(module.ModuleModel):  # pylint: disable=R0902
         self.stop_event.set()
         self.announcer.join(3.0)
         #
+        if self.update_coalescer is not None:
+            self.update_coalescer.join(3.0)
+        #
+        if self.sampler is not None:
+            self.sampler.stop()
+        #
+        if self.blocking_monitor is not None:
+            self.blocking_monitor.stop()
+        #
+        self.memory_tracer.stop()
+        #
         self.context.event_manager.fire_event(
             "bootstrap_runtime_info_prune",
             {
@@ -294,9 +746,17 @@ class Module(module.ModuleModel):  # pylint: disable=R0902
             self.repo_resolver.deinit()
         #
         self._deinit_mesh()
+        self._dispose_db_engines()
 
     def get_bundle(self, name, **kwargs):  # pylint: disable=R0912,R0914,R0915
         """ Bundle """
+        import zipfile  # pylint: disable=C0415
+        import tarfile  # pylint: disable=C0415
+        import tempfile  # pylint: disable=C0415
+        #
+        requests = timed_import("requests")
+        download = timed_import(".tools.download", __package__)
+        #
         session = None
         target_url = None
         #
@@ -346,6 +806,31 @@ class Module(module.ModuleModel):  # pylint: disable=R0902
             log.info("Bundle installation or update is not needed: %s", name)
             return
         #
+        bundle_policy = get_policy(
+            "bundle", kwargs,
+            initial_delay=kwargs.get("download_backoff", 1.0),
+            max_attempts=kwargs.get("download_retries", 5) + 1,
+            failure_threshold=10,
+        )
+        #
+        bundle_priority = PRIORITY_BUNDLE + kwargs.get("download_priority", 0)
+        bundle_digest = kwargs.get("digest", None)
+        #
+        if bundle_digest is None and kwargs.get("verify_digest", False):
+            metadata_url = target_url.rsplit("/", 1)[0] + "/metadata"
+            #
+            def _get_bundle_metadata():
+                with session.get(metadata_url, timeout=60) as response:
+                    response.raise_for_status()
+                    return response.json()
+            #
+            bundle_digest = download.get_metadata_digest(
+                bundle_policy.call(_get_bundle_metadata, retry_if=is_transient_error)
+            )
+            #
+            if bundle_digest is None:
+                raise RuntimeError(f"Bundle metadata has no digest: {name}")
+        #
         processing = kwargs.get("processing", None)
         #
         if processing == "zip_extract" and "extract_target" in kwargs:
@@ -355,13 +840,14 @@ class Module(module.ModuleModel):  # pylint: disable=R0902
             extract_cleanup_skip_dirs = kwargs.get("extract_cleanup_skip_dirs", [])
             #
             with tempfile.TemporaryFile() as temp_file:
-                with session.get(target_url, stream=True) as response:
-                    response.raise_for_status()
-                    #
-                    for chunk in response.iter_content(chunk_size=8192):
-                        temp_file.write(chunk)
+                with scheduler.slot(target_url, bundle_priority):
+                    download.download(
+                        session, target_url, temp_file,
+                        digest=bundle_digest,
+                        policy=bundle_policy,
+                    )
                 #
-                temp_file.seek(0)
+                extract_started = time.perf_counter()
                 #
                 with zipfile.ZipFile(temp_file) as zip_file:
                     if extract_cleanup:
@@ -386,6 +872,9 @@ class Module(module.ModuleModel):  # pylint: disable=R0902
                     #
                     zip_file.extractall(extract_target)
             #
+            bundle_extract_seconds.observe(
+                time.perf_counter() - extract_started, processing="zip_extract",
+            )
             log.info("Bundle ZIP extracted: %s -> %s", name, extract_target)
             #
             return
@@ -397,13 +886,14 @@ class Module(module.ModuleModel):  # pylint: disable=R0902
             extract_cleanup_skip_dirs = kwargs.get("extract_cleanup_skip_dirs", [])
             #
             with tempfile.TemporaryFile() as temp_file:
-                with session.get(target_url, stream=True) as response:
-                    response.raise_for_status()
-                    #
-                    for chunk in response.iter_content(chunk_size=8192):
-                        temp_file.write(chunk)
+                with scheduler.slot(target_url, bundle_priority):
+                    download.download(
+                        session, target_url, temp_file,
+                        digest=bundle_digest,
+                        policy=bundle_policy,
+                    )
                 #
-                temp_file.seek(0)
+                extract_started = time.perf_counter()
                 #
                 with tarfile.open(mode="r", fileobj=temp_file) as tar_file:
                     if extract_cleanup:
@@ -428,73 +918,230 @@ class Module(module.ModuleModel):  # pylint: disable=R0902
                     #
                     tar_file.extractall(extract_target)
             #
+            bundle_extract_seconds.observe(
+                time.perf_counter() - extract_started, processing="tar_extract",
+            )
             log.info("Bundle TAR extracted: %s -> %s", name, extract_target)
             #
             return
         #
         raise RuntimeError("Unknown processing type")
 
-    def ensure_db(
+    def _get_db_engine(self, db_url, use_managed_identity=False):
+        """ Get shared admin (AUTOCOMMIT) engine for DB URL """
+        import sqlalchemy  # pylint: disable=C0415,E0401
+        #
+        engine_key = (db_url, bool(use_managed_identity))
+        #
+        with self.db_engines_lock:
+            if engine_key in self.db_engines:
+                return self.db_engines[engine_key]
+            #
+            db_engine = sqlalchemy.create_engine(
+                db_url,
+                isolation_level="AUTOCOMMIT",
+            )
+            #
+            if use_managed_identity:
+                from sqlalchemy import event  # pylint: disable=E0401,C0415
+                #
+                token_cache = self._get_db_token_cache()
+                #
+                @event.listens_for(db_engine, "do_connect")
+                def _get_managed_token(dialect, conn_rec, cargs, cparams):  # pylint: disable=W0613
+                    cparams["password"] = token_cache.get_token()
+            #
+            self.db_engines[engine_key] = db_engine
+            return db_engine
+
+    def _get_db_token_cache(self):
+        """ Get shared managed identity token cache for DB connections """
+        if self.db_token_cache is None:
+            identity = timed_import(".tools.identity", __package__)
+            #
+            identity_config = self.descriptor.config.get("autocreate_dbs", {})
+            if not isinstance(identity_config, dict):
+                identity_config = {}
+            #
+            static_token = identity_config.get("managed_identity_static_token", None)
+            #
+            if static_token is not None:
+                credential_factory = functools.partial(identity.StaticCredential, static_token)
+            else:
+                credential_factory = identity.default_credential
+            #
+            self.db_token_cache = identity.TokenCache(
+                credential_factory,
+                identity_config.get("managed_identity_scope", identity.DB_TOKEN_SCOPE),
+                refresh_margin=identity_config.get("managed_identity_refresh_margin", 300),
+            )
+        #
+        return self.db_token_cache
+
+    def _dispose_db_engines(self):
+        with self.db_engines_lock:
+            while self.db_engines:
+                _, db_engine = self.db_engines.popitem()
+                #
+                try:
+                    db_engine.dispose()
+                except:  # pylint: disable=W0702
+                    pass
+
+    def _wait_for_db(
             self,
-            db_url,
-            db_name,
-            use_managed_identity=False,
+            db_engine,
             mute_first_failed_connections=0,
             connection_retry_interval=3.0,
             max_failed_connections=None,
             log_errors=True,
-        ):  # pylint: disable=R0912,R0914,R0915
-        """ Create DB if not exists and return True (if created) """
-        log.info("Ensuring DB exists: %s", db_name)
-        #
-        import sqlalchemy  # pylint: disable=C0415,E0401
+        ):
+        autocreate_dbs = self.descriptor.config.get("autocreate_dbs", {})
+        if not isinstance(autocreate_dbs, dict):
+            autocreate_dbs = {}
         #
-        db_engine = sqlalchemy.create_engine(
-            db_url,
-            isolation_level="AUTOCOMMIT",
+        policy = get_policy(
+            "ensure_db", autocreate_dbs,
+            max_delay=60.0,
+            failure_threshold=None,
         )
         #
-        if use_managed_identity:
-            from sqlalchemy import event  # pylint: disable=E0401,C0415
-            from azure.identity import DefaultAzureCredential  # pylint: disable=E0401,C0415
-            #
-            @event.listens_for(db_engine, "do_connect")
-            def _get_managed_token(dialect, conn_rec, cargs, cparams):  # pylint: disable=W0613
-                credential = DefaultAzureCredential()
-                token = credential.get_token("https://ossrdbms-aad.database.windows.net/.default").token
-                cparams["password"] = token
-        #
-        failed_connections = 0
+        try:
+            retry_state = policy.begin(
+                initial_delay=connection_retry_interval,
+                max_attempts=max_failed_connections + 1 if max_failed_connections else None,
+            )
+        except CircuitOpenError as exception:
+            log.error("Not waiting for DB: %s", exception)
+            return False
         #
         while True:
             try:
                 connection = db_engine.connect()
                 connection.close()
                 #
-                break
+                retry_state.succeeded()
+                return True
             except:  # pylint: disable=W0702
+                delay = retry_state.next_delay()
+                #
+                if delay is None:
+                    log.error(
+                        "Failed to create DB connection after %s attempts (%.2f seconds waited)",
+                        retry_state.attempt, retry_state.waited,
+                    )
+                    return False
+                #
                 if log_errors and \
-                        failed_connections >= mute_first_failed_connections:
+                        retry_state.attempt > mute_first_failed_connections:
                     #
                     log.exception(
-                        "Failed to create DB connection. Retrying in %s seconds",
-                        connection_retry_interval,
+                        "Failed to create DB connection. Retrying in %.2f seconds",
+                        delay,
                     )
                 #
-                failed_connections += 1
-                #
-                if max_failed_connections and failed_connections > max_failed_connections:
-                    break
-                #
-                time.sleep(connection_retry_interval)
+                if not retry_state.sleep(delay, self.stop_event):
+                    return False
+
+    @staticmethod
+    def _get_existing_dbs(connection):
+        """ Get lower-cased names of existing DBs, None if catalog is not known """
+        import sqlalchemy  # pylint: disable=C0415,E0401
+        #
+        queries = {
+            "postgresql": "SELECT datname FROM pg_database",
+            "mysql": "SELECT schema_name FROM information_schema.schemata",
+            "mariadb": "SELECT schema_name FROM information_schema.schemata",
+            "mssql": "SELECT name FROM sys.databases",
+        }
+        #
+        query = queries.get(connection.dialect.name, None)
+        if query is None:
+            return None
+        #
+        try:
+            return {
+                str(row[0]).lower()
+                for row in connection.execute(sqlalchemy.text(query))
+            }
+        except:  # pylint: disable=W0702
+            log.exception("Failed to list existing DBs")
+            return None
+
+    def ensure_dbs(
+            self,
+            db_url,
+            db_names,
+            use_managed_identity=False,
+            mute_first_failed_connections=0,
+            connection_retry_interval=3.0,
+            max_failed_connections=None,
+            log_errors=True,
+        ):  # pylint: disable=R0913
+        """ Create missing DBs, return {db_name: True (if created)} """
+        import sqlalchemy  # pylint: disable=C0415,E0401
+        #
+        db_names = list(dict.fromkeys(db_names))
+        if not db_names:
+            return {}
+        #
+        log.info("Ensuring DBs exist: %s", ", ".join(db_names))
+        #
+        db_engine = self._get_db_engine(db_url, use_managed_identity)
+        #
+        if not self._wait_for_db(
+                db_engine,
+                mute_first_failed_connections=mute_first_failed_connections,
+                connection_retry_interval=connection_retry_interval,
+                max_failed_connections=max_failed_connections,
+                log_errors=log_errors,
+        ):
+            log.error("DB server is not reachable, not ensuring DBs: %s", ", ".join(db_names))
+            return {db_name: False for db_name in db_names}
+        #
+        result = {}
         #
         with db_engine.connect() as connection:
-            try:
-                connection.execute(
-                    sqlalchemy.text(f"CREATE DATABASE {db_name}")
-                )
-                log.info("DB created: %s", db_name)
-                return True
-            except:  # pylint: disable=W0702
-                log.info("DB already exists (or failed to create): %s", db_name)
-                return False
+            existing_dbs = self._get_existing_dbs(connection)
+            #
+            for db_name in db_names:
+                if existing_dbs is not None and db_name.lower() in existing_dbs:
+                    log.info("DB already exists: %s", db_name)
+                    result[db_name] = False
+                    continue
+                #
+                try:
+                    connection.execute(
+                        sqlalchemy.text(f"CREATE DATABASE {db_name}")
+                    )
+                    log.info("DB created: %s", db_name)
+                    result[db_name] = True
+                except:  # pylint: disable=W0702
+                    log.info("DB already exists (or failed to create): %s", db_name)
+                    result[db_name] = False
+        #
+        return result
+
+    def ensure_db(
+            self,
+            db_url,
+            db_name,
+            use_managed_identity=False,
+            mute_first_failed_connections=0,
+            connection_retry_interval=3.0,
+            max_failed_connections=None,
+            log_errors=True,
+        ):  # pylint: disable=R0913
+        """ Create DB if not exists and return True (if created) """
+        return self.ensure_dbs(
+            db_url=db_url,
+            db_names=[db_name],
+            use_managed_identity=use_managed_identity,
+            mute_first_failed_connections=mute_first_failed_connections,
+            connection_retry_interval=connection_retry_interval,
+            max_failed_connections=max_failed_connections,
+            log_errors=log_errors,
+        ).get(db_name, False)
+
+
+record_import_time(__name__, time.perf_counter() - MODULE_IMPORT_STARTED)
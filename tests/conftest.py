@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Tests: shared fixtures """
+
+import os
+import sys
+import types
+import importlib
+import importlib.util
+
+import pytest  # pylint: disable=E0401
+
+
+PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLUGIN_PACKAGE = "bootstrap"
+
+
+def load_plugin_module(name):
+    """ Import plugin submodule (e.g. 'tools.update') without running plugin __init__ """
+    if PLUGIN_PACKAGE not in sys.modules:
+        package = types.ModuleType(PLUGIN_PACKAGE)
+        package.__path__ = [PLUGIN_ROOT]
+        sys.modules[PLUGIN_PACKAGE] = package
+    #
+    return importlib.import_module(f"{PLUGIN_PACKAGE}.{name}")
+
+
+def pytest_collection_modifyitems(config, items):  # pylint: disable=W0613
+    """ Skip everything without pylon (plugin package __init__ imports it) """
+    if importlib.util.find_spec("pylon") is not None:
+        return
+    #
+    skip = pytest.mark.skip(reason="pylon is not installed")
+    #
+    for item in items:
+        item.add_marker(skip)
+
+
+@pytest.fixture
+def plugin_module():
+    """ Loader of plugin submodules """
+    return load_plugin_module
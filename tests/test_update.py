@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Tests: runtime update payload merging """
+
+import pytest  # pylint: disable=E0401
+
+
+def _payload(restart=None, **kwargs):
+    payload = {"plugins": [], **kwargs}
+    #
+    if restart is not None:
+        payload["restart"] = restart
+    #
+    return payload
+
+
+@pytest.mark.parametrize("values", [
+    (True, False),
+    (False, True),
+    (True, "auto"),
+    ("auto", True),
+    (True, None),
+])
+def test_true_wins(plugin_module, values):
+    """ Explicit True over anything """
+    update = plugin_module("tools.update")
+    result = update.merge_payloads([_payload(value) for value in values])
+    #
+    assert result["restart"] is True
+    assert "restart_exempt" not in result
+
+
+@pytest.mark.parametrize("values", [
+    (False,),
+    (False, False),
+])
+def test_all_false(plugin_module, values):
+    """ False only when every payload says so """
+    update = plugin_module("tools.update")
+    #
+    assert update.merge_payloads([_payload(value) for value in values])["restart"] is False
+
+
+@pytest.mark.parametrize("values", [
+    ("auto", "auto"),
+    (None, None),
+    ("auto", None),
+])
+def test_auto(plugin_module, values):
+    """ Defaults stay "auto" """
+    update = plugin_module("tools.update")
+    result = update.merge_payloads([_payload(value) for value in values])
+    #
+    assert result["restart"] == "auto"
+    assert "restart_exempt" not in result
+
+
+@pytest.mark.parametrize("values", [
+    (False, "auto"),
+    ("auto", False),
+    (False, None),
+    (None, False),
+])
+def test_false_with_auto(plugin_module, values):
+    """ Mixed: "auto", changes of False payloads do not count as restart reasons """
+    update = plugin_module("tools.update")
+    payloads = []
+    #
+    for value in values:
+        if value is False:
+            payloads.append(_payload(
+                value,
+                plugins=["quiet_plugin", "shared"],
+                configs={"quiet_config": "data"},
+                actions=["update_pylon_config"],
+            ))
+        else:
+            payloads.append(_payload(
+                value,
+                plugins=["loud_plugin", "shared"],
+                configs={"loud_config": "data"},
+            ))
+    #
+    result = update.merge_payloads(payloads)
+    #
+    assert result["restart"] == "auto"
+    assert result["restart_exempt"]["plugins"] == ["quiet_plugin"]
+    assert result["restart_exempt"]["configs"] == ["quiet_config"]
+    assert result["restart_exempt"]["actions"] == ["update_pylon_config"]
+
+
+def test_dry_run_keeps_arrival_order(plugin_module):
+    """ Dry run arriving mid-window flushes the batch collected before it """
+    update = plugin_module("tools.update")
+    coalescer = update.UpdateCoalescer(None, None, {"update_coalesce_window": 0.1})
+    #
+    second = _payload(plugins=["second"])
+    dry_run = _payload(plugins=["dry"], dry_run=True)
+    later = _payload(plugins=["later"])
+    #
+    for payload in [second, dry_run, later]:
+        coalescer.submit(payload)
+    #
+    first = _payload(plugins=["first"])
+    payloads, dry_run_payload = coalescer._collect(first)  # pylint: disable=W0212
+    #
+    assert payloads == [first, second]
+    assert dry_run_payload is dry_run
+    assert coalescer.queue.get_nowait() is later
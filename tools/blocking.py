@@ -0,0 +1,208 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Gevent event loop blocking detector """
+
+import os
+import sys
+import time
+import traceback
+import collections
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+from .sampler import get_native_primitives, get_native_lock, get_native_ident
+
+
+def _is_library_frame(frame):
+    filename = frame.f_code.co_filename
+    return f"{os.sep}gevent{os.sep}" in filename or \
+        f"{os.sep}greenlet{os.sep}" in filename or \
+        filename.startswith("<")
+
+
+def get_call_site(frame):
+    """ Get innermost non-gevent frame as 'file:line function' """
+    site = frame
+    #
+    while site is not None and _is_library_frame(site):
+        site = site.f_back
+    #
+    if site is None:
+        site = frame
+    #
+    return f"{site.f_code.co_filename}:{site.f_lineno} {site.f_code.co_name}"
+
+
+class BlockingMonitor:  # pylint: disable=R0902
+    """ Detect greenlets that hold the hub longer than threshold """
+
+    def __init__(self, threshold=0.1, max_sites=500):
+        self.threshold = threshold
+        self.max_sites = max_sites
+        #
+        self.lock = get_native_lock()
+        self.sites = {}
+        self.events = 0
+        self.pending = collections.deque(maxlen=100)  # log records, logged from hub
+        #
+        self.running = False
+        self.hub = None
+        self.main_ident = None
+        self.previous_tracer = None
+        #
+        self.switch_id = 0
+        self.switch_time = time.perf_counter()
+        self.switch_target = None
+
+    def _tracer(self, event, args):
+        if event in ["switch", "throw"]:
+            self.switch_id += 1
+            self.switch_time = time.perf_counter()
+            self.switch_target = args[1]
+        #
+        if self.previous_tracer is not None:
+            self.previous_tracer(event, args)
+
+    def start(self):
+        """ Start monitor (must be called from hub thread) """
+        import greenlet  # pylint: disable=E0401,C0415
+        from gevent import get_hub  # pylint: disable=E0401,C0415
+        #
+        if self.running:
+            return
+        #
+        self.hub = get_hub()
+        self.main_ident = get_native_ident()
+        self.previous_tracer = greenlet.settrace(self._tracer)
+        #
+        self.running = True
+        #
+        start_new_thread, _ = get_native_primitives()
+        start_new_thread(self._run, ())
+
+    def stop(self):
+        """ Stop monitor """
+        import greenlet  # pylint: disable=E0401,C0415
+        #
+        if not self.running:
+            return
+        #
+        self.running = False
+        #
+        # greenlet.settrace is per thread: restore tracer on hub thread
+        if get_native_ident() == self.main_ident:
+            greenlet.settrace(self.previous_tracer)
+        else:
+            self.hub.loop.run_callback_threadsafe(greenlet.settrace, self.previous_tracer)
+        #
+        self._drain()
+
+    def _notify(self, *item):
+        # Called from monitor thread: no logging here, hub logs when it gets control back
+        self.pending.append(item)
+        #
+        try:
+            self.hub.loop.run_callback_threadsafe(self._drain)
+        except:  # pylint: disable=W0702
+            pass
+
+    def _drain(self):
+        while self.pending:
+            try:
+                item = self.pending.popleft()
+            except IndexError:
+                break
+            #
+            if item[0] == "error":
+                log.error("Failed to record blocking event:\n%s", item[1])
+            else:
+                log.warning("Event loop blocked for %.3f seconds at %s", item[1], item[2])
+
+    def _run(self):
+        _, sleep = get_native_primitives()
+        reported_switch = None
+        #
+        while self.running:
+            sleep(self.threshold / 2)
+            #
+            switch_id = self.switch_id
+            target = self.switch_target
+            blocked_for = time.perf_counter() - self.switch_time
+            #
+            if switch_id == reported_switch or target is None or target is self.hub:
+                continue
+            #
+            if blocked_for < self.threshold:
+                continue
+            #
+            frame = sys._current_frames().get(self.main_ident, None)  # pylint: disable=W0212
+            if frame is None or switch_id != self.switch_id:
+                continue
+            #
+            reported_switch = switch_id
+            #
+            try:
+                self._record(frame, blocked_for)
+            except:  # pylint: disable=W0702
+                self._notify("error", traceback.format_exc())
+
+    def _record(self, frame, blocked_for):
+        site = get_call_site(frame)
+        #
+        with self.lock:
+            self.events += 1
+            #
+            if site not in self.sites:
+                if len(self.sites) >= self.max_sites:
+                    return
+                #
+                self.sites[site] = {
+                    "count": 0,
+                    "max_blocked": 0.0,
+                    "last_seen": None,
+                    "stack": None,
+                }
+            #
+            item = self.sites[site]
+            item["count"] += 1
+            item["max_blocked"] = max(item["max_blocked"], blocked_for)
+            item["last_seen"] = time.time()
+            item["stack"] = traceback.format_stack(frame)
+        #
+        self._notify("blocked", blocked_for, site)
+
+    def report(self, top=20, with_stacks=True):
+        """ Get per call site counts, most frequent first """
+        self._drain()
+        #
+        with self.lock:
+            sites = sorted(
+                self.sites.items(), key=lambda item: item[1]["count"], reverse=True,
+            )[:top]
+            #
+            return {
+                "threshold": self.threshold,
+                "events": self.events,
+                "sites": {
+                    site: {
+                        key: value for key, value in item.items()
+                        if with_stacks or key != "stack"
+                    }
+                    for site, item in sites
+                },
+            }
@@ -0,0 +1,201 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Download """
+
+import hashlib
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+from .retry import RetryPolicy, TransientError, is_transient_error
+from .metrics import registry
+from .scheduler import scheduler
+
+
+downloaded_bytes = registry.counter(
+    "bootstrap_download_bytes_total", "Bytes received by resumable downloads",
+)
+
+
+DIGEST_KEYS = ["source_digest", "digest", "sha256"]
+
+
+class DigestMismatchError(RuntimeError):
+    """ Downloaded data does not match expected digest """
+
+
+class IncompleteDownloadError(TransientError):
+    """ Connection closed before all data was received """
+
+
+def get_metadata_digest(metadata):
+    """ Get expected digest from (depot) metadata, if any """
+    if not isinstance(metadata, dict):
+        return None
+    #
+    for key in DIGEST_KEYS:
+        if metadata.get(key, None):
+            return metadata[key]
+    #
+    return None
+
+
+def file_digest(file, digest):
+    """ Compute digest of open binary file in the same form as expected digest """
+    if ":" in digest:
+        algorithm, _ = digest.split(":", 1)
+    else:
+        algorithm = "sha256"
+    #
+    hasher = hashlib.new(algorithm)
+    file.seek(0)
+    #
+    while True:
+        chunk = file.read(65536)
+        if not chunk:
+            break
+        #
+        hasher.update(chunk)
+    #
+    if ":" in digest:
+        return f"{algorithm}:{hasher.hexdigest()}"
+    #
+    return hasher.hexdigest()
+
+
+def _get_validator(response):
+    etag = response.headers.get("ETag", None)
+    if etag is not None and not etag.startswith("W/"):
+        return etag
+    #
+    return response.headers.get("Last-Modified", None)
+
+
+def _get_total_size(response, offset):
+    if response.status_code == 206:
+        content_range = response.headers.get("Content-Range", "")
+        total = content_range.rsplit("/", 1)[-1]
+        #
+        try:
+            return int(total)
+        except:  # pylint: disable=W0702
+            return None
+    #
+    try:
+        return offset + int(response.headers["Content-Length"])
+    except:  # pylint: disable=W0702
+        return None
+
+
+def download(  # pylint: disable=R0912,R0913,R0914,R0915
+        session, url, target_file,
+        digest=None,
+        retries=5,
+        backoff=1.0,
+        max_backoff=30.0,
+        timeout=60,
+        chunk_size=65536,
+        policy=None,
+    ):
+    """ Download URL into open binary file, resume interrupted transfers, verify digest """
+    import requests  # pylint: disable=E0401,C0415
+    #
+    if policy is None:
+        policy = RetryPolicy(
+            "download",
+            initial_delay=backoff,
+            max_delay=max_backoff,
+            max_attempts=retries + 1,
+        )
+    #
+    retry_state = policy.begin()
+    #
+    offset = 0
+    validator = None
+    #
+    target_file.seek(0)
+    target_file.truncate()
+    #
+    while True:
+        headers = {}
+        #
+        if offset > 0 and validator is not None:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+        elif offset > 0:
+            offset = 0  # no validator: resuming could mix two versions
+            target_file.seek(0)
+            target_file.truncate()
+        #
+        try:
+            with session.get(url, stream=True, headers=headers, timeout=timeout) as response:
+                if offset > 0 and response.status_code in [200, 416]:
+                    log.info("Server did not resume download, restarting: %s", url)
+                    #
+                    offset = 0
+                    target_file.seek(0)
+                    target_file.truncate()
+                    #
+                    if response.status_code == 416:
+                        validator = None
+                        continue
+                #
+                response.raise_for_status()
+                #
+                validator = _get_validator(response)
+                total_size = _get_total_size(response, offset)
+                #
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    target_file.write(chunk)
+                    offset += len(chunk)
+                    downloaded_bytes.inc(len(chunk))
+                    scheduler.throttle(url, len(chunk))
+                #
+                if total_size is not None and offset < total_size:
+                    raise IncompleteDownloadError(
+                        f"Received {offset} of {total_size} bytes"
+                    )
+            #
+            retry_state.succeeded()
+            break
+        except (requests.exceptions.RequestException, IOError) as exception:
+            if not is_transient_error(exception):
+                retry_state.failed()
+                raise
+            #
+            delay = retry_state.next_delay()
+            #
+            if delay is None:
+                raise
+            #
+            log.warning(
+                "Download interrupted at %s bytes (%s), retry %s in %.2f seconds: %s",
+                offset, exception, retry_state.attempt, delay, url,
+            )
+            #
+            retry_state.sleep(delay)
+    #
+    if digest is not None:
+        actual_digest = file_digest(target_file, digest)
+        #
+        if actual_digest.lower() != digest.lower():
+            raise DigestMismatchError(
+                f"Digest mismatch for {url}: expected {digest}, got {actual_digest}"
+            )
+    #
+    target_file.seek(0)
+    return offset
@@ -0,0 +1,190 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Cooperative resolver and download engine """
+
+import concurrent.futures
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+from .repo import resolver_lookups
+from .timeline import get_tree_size
+from .scheduler import scheduler, PRIORITY_PRELOAD
+
+
+def is_cooperative_runtime():
+    """ Check if sockets are patched by gevent (blocking I/O yields to the hub) """
+    try:
+        from gevent import monkey  # pylint: disable=E0401,C0415
+        #
+        return monkey.is_module_patched("socket")
+    except ImportError:
+        return False
+
+
+def get_leaf_resolvers(resolver):
+    """ Get resolvers that do actual lookups, in RepoResolver.find priority order """
+    if not resolver.sub_resolvers:
+        return [resolver]
+    #
+    result = []
+    #
+    for sub_resolver in resolver.sub_resolvers:
+        result.extend(get_leaf_resolvers(sub_resolver))
+    #
+    return result
+
+
+class TaskPool:  # pylint: disable=R0903
+    """ Bounded concurrency calls: greenlets on cooperative runtime, threads otherwise """
+
+    def __init__(self, size, cooperative=None):
+        self.size = max(int(size), 1)
+        self.cooperative = is_cooperative_runtime() if cooperative is None else cooperative
+
+    def map(self, func, items):
+        """ Call func(item) for all items, return [(result, exception)] in items order """
+        items = list(items)
+        #
+        if not items:
+            return []
+        #
+        def _call(item):
+            try:
+                return func(item), None
+            except Exception as exception:  # pylint: disable=W0703
+                return None, exception
+        #
+        if self.cooperative:
+            from gevent.pool import Pool  # pylint: disable=E0401,C0415
+            #
+            return list(Pool(self.size).imap(_call, items))
+        #
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(self.size, len(items)),
+                thread_name_prefix="bootstrap_engine",
+        ) as executor:
+            return list(executor.map(_call, items))
+
+
+class CooperativeEngine:
+    """ Concurrent plugin lookups, metadata fetches and source downloads """
+
+    def __init__(self, config, timeline=None):
+        cooperative = config.get("cooperative", None)
+        #
+        self.probe_pool = TaskPool(config.get("concurrency", 64), cooperative)
+        self.download_pool = TaskPool(config.get("download_concurrency", 8), cooperative)
+        self.timeline = timeline
+
+    @property
+    def mode(self):
+        """ Concurrency mode name """
+        return "gevent" if self.probe_pool.cooperative else "threads"
+
+    def find(self, resolver, plugins):
+        """ Resolve plugins, return {plugin: (resolver, plugin info)} for found ones """
+        result = {}
+        pending = []
+        #
+        for plugin in plugins:
+            if plugin in resolver.resolved:
+                result[plugin] = resolver.resolved[plugin]
+            elif plugin not in pending:
+                pending.append(plugin)
+        #
+        # One round per leaf resolver: same probes and priority as sequential find
+        #
+        for leaf_resolver in get_leaf_resolvers(resolver):
+            if not pending:
+                break
+            #
+            still_pending = []
+            #
+            for plugin, (found, exception) in zip(
+                    pending, self.probe_pool.map(leaf_resolver.find, pending),
+            ):
+                if exception is not None:
+                    log.warning("Plugin lookup failed: %s (%s)", plugin, exception)
+                #
+                if found is None:
+                    still_pending.append(plugin)
+                    continue
+                #
+                resolver.resolved[plugin] = found
+                result[plugin] = found
+                #
+                if not resolver.repo_id:
+                    resolver_lookups.inc(result="hit")
+            #
+            pending = still_pending
+        #
+        return result
+
+    def get_metadata(self, found):
+        """ Fetch metadata for {plugin: (resolver, plugin info)}, return {plugin: metadata} """
+        items = list(found.items())
+        result = {}
+        #
+        def _get_metadata(item):
+            resolver, plugin_info = item[1]
+            return resolver.metadata_provider.get_metadata(
+                {"source": plugin_info["objects"]["metadata"]}
+            )
+        #
+        for (plugin, _), (metadata, exception) in zip(
+                items, self.probe_pool.map(_get_metadata, items),
+        ):
+            if exception is not None:
+                log.warning("Plugin metadata fetch failed: %s (%s)", plugin, exception)
+                continue
+            #
+            result[plugin] = metadata
+        #
+        return result
+
+    def get_sources(self, downloads, priorities=None):
+        """ Fetch sources for [(plugin, resolver, source target)], return {plugin: path} """
+        result = {}
+        priorities = priorities or {}
+        #
+        def _get_source(item):
+            plugin, resolver, source_target = item
+            #
+            with scheduler.slot(
+                    source_target.get("source", None),
+                    priorities.get(plugin, PRIORITY_PRELOAD),
+            ):
+                if self.timeline is None:
+                    return resolver.source_provider.get_source(source_target)
+                #
+                with self.timeline.phase("download", plugin) as phase:
+                    source = resolver.source_provider.get_source(source_target)
+                    phase["bytes"] = get_tree_size(source)
+                #
+                return source
+        #
+        for (plugin, _, _), (source, exception) in zip(
+                downloads, self.download_pool.map(_get_source, downloads),
+        ):
+            if exception is not None:
+                log.warning("Plugin source fetch failed: %s (%s)", plugin, exception)
+                continue
+            #
+            result[plugin] = source
+        #
+        return result
@@ -25,6 +25,15 @@ import threading
 from pylon.core.tools import log  # pylint: disable=E0611,E0401
 from pylon.core.tools import config as pylon_config  # pylint: disable=E0611,E0401
 
+from .metrics import registry
+from .memory import get_process_memory
+
+
+announcement_bytes = registry.gauge(
+    "bootstrap_announcement_bytes",
+    "Size of runtime announcement payload (JSON), sampled every announce_size_every announcements",
+)
+
 
 class RuntimeAnnoucer(threading.Thread):  # pylint: disable=R0903
     """ Announce about runtime config periodically """
@@ -34,39 +43,89 @@ class RuntimeAnnoucer(threading.Thread):  # pylint: disable=R0903
         self.module = module
         self.config = config
         self.interval = self.config.get("announce_interval", 15)
+        self.light = self.config.get("light", False)
         self.last_announce = time.time()
+        #
+        # Event manager serializes payload itself (sent bytes are not exposed):
+        # measure size with extra json.dumps only on every N-th announcement
+        self.size_every = max(int(self.config.get("announce_size_every", 10)), 1)
+        self.announcements = 0
+
+    @staticmethod
+    def _collect_descriptor_info(descriptor, light=False):
+        result = {
+            "name": descriptor.name,
+            "description": descriptor.metadata.get("name", ""),
+            "prepared": descriptor.prepared,
+            "activated": descriptor.activated,
+            "local_version": descriptor.metadata.get("version", "0.0.0"),
+            "repo_version": "-",
+        }
+        #
+        if light:
+            return result
+        #
+        result["metadata"] = descriptor.metadata
+        result["config"] = descriptor.config
+        #
+        try:
+            result["config_data"] = descriptor.config_data.decode()
+        except:  # pylint: disable=W0702
+            pass
+        #
+        try:
+            schema_path = os.path.join(descriptor.path, "admin_schema.json")
+            if os.path.isfile(schema_path):
+                with open(schema_path, "r", encoding="utf-8") as f:
+                    result["admin_schema"] = json.load(f)
+        except:  # pylint: disable=W0702
+            pass
+        #
+        return result
 
     def _collect_info(self):
         result = []
         module_manager = self.module.context.module_manager
         #
+        memory = self.module.memory_tracer.last
+        memory_plugins = memory["plugins"] if memory is not None else {}
+        #
         for descriptor in module_manager.descriptors.values():
-            result.append({
-                "name": descriptor.name,
-                "description": descriptor.metadata.get("name", ""),
-                "prepared": descriptor.prepared,
-                "activated": descriptor.activated,
-                "local_version": descriptor.metadata.get("version", "0.0.0"),
-                "repo_version": "-",
-                "metadata": descriptor.metadata,
-                "config": descriptor.config,
-            })
-            #
-            try:
-                result[-1]["config_data"] = descriptor.config_data.decode()
-            except:  # pylint: disable=W0702
-                pass
+            result.append(self._collect_descriptor_info(descriptor, self.light))
             #
-            try:
-                schema_path = os.path.join(descriptor.path, "admin_schema.json")
-                if os.path.isfile(schema_path):
-                    with open(schema_path, "r", encoding="utf-8") as f:
-                        result[-1]["admin_schema"] = json.load(f)
-            except:  # pylint: disable=W0702
-                pass
+            if descriptor.name in memory_plugins:
+                result[-1]["memory"] = memory_plugins[descriptor.name]
         #
         return result
 
+    def collect_plugin_info(self, plugin, light=False):
+        """ Get full (or light) runtime info of one plugin """
+        module_manager = self.module.context.module_manager
+        #
+        if plugin not in module_manager.descriptors:
+            return None
+        #
+        return self._collect_descriptor_info(module_manager.descriptors[plugin], light)
+
+    def _collect_memory(self):
+        memory = self.module.memory_tracer.last
+        #
+        return {
+            "process": get_process_memory(),
+            "tracing": self.module.memory_tracer.tracing,
+            "sampled": memory["time"] if memory is not None else None,
+            "traced": memory["traced"] if memory is not None else None,
+            "untracked": memory["plugins"].get("[other]", None) if memory is not None else None,
+        }
+
+    def _collect_profile(self):
+        sampler = self.module.sampler
+        #
+        if sampler is None or not sampler.running:
+            return None
+        #
+        return sampler.snapshot(top=10 if self.light else 100)
+
     def _collect_pylon_settings(self):
         result = {}
         #
@@ -90,14 +149,27 @@ class RuntimeAnnoucer(threading.Thread):  # pylint: disable=R0903
                 now = time.time()
                 if now - self.last_announce >= self.interval:
                     self.last_announce = now
+                    payload = {
+                        "pylon_id": self.module.context.id,
+                        "pylon_settings": self._collect_pylon_settings(),
+                        "runtime_info": self._collect_info(),
+                        "logs": [] if self.light else self.module.log_buffer.copy(),
+                        "boot_timeline": self.module.timeline.summary() \
+                            if self.light else self.module.timeline.to_list(),
+                        "profile": self._collect_profile(),
+                        "memory": self._collect_memory(),
+                        "blocking": self.module.blocking_monitor.report(
+                            with_stacks=not self.light,
+                        ) if self.module.blocking_monitor is not None else None,
+                    }
+                    #
+                    if self.announcements % self.size_every == 0:
+                        announcement_bytes.set(len(json.dumps(payload, default=str)))
+                    #
+                    self.announcements += 1
+                    #
                     self.module.context.event_manager.fire_event(
-                        "bootstrap_runtime_info",
-                        {
-                            "pylon_id": self.module.context.id,
-                            "pylon_settings": self._collect_pylon_settings(),
-                            "runtime_info": self._collect_info(),
-                            "logs": self.module.log_buffer.copy(),
-                        },
+                        "bootstrap_runtime_info", payload,
                     )
             except:  # pylint: disable=W0702
                 log.exception("Exception in announcer thread, continuing")
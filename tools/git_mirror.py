@@ -0,0 +1,187 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Source provider: git sources materialized from local bare mirror cache """
+
+import os
+import re
+import base64
+import shutil
+import hashlib
+import tarfile
+import tempfile
+import threading
+import subprocess
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+
+URL_CREDENTIALS = re.compile(r"(://)[^/@\s]+@")
+
+
+class GitError(RuntimeError):
+    """ Git command failed (message is sanitized: no credentials) """
+
+
+def sanitize(text):
+    """ Remove credentials from URLs in text """
+    return URL_CREDENTIALS.sub(r"\1***@", str(text))
+
+
+class Provider:  # pylint: disable=R0903
+    """ Source provider """
+
+    def __init__(self, context, settings):
+        self.context = context
+        self.settings = settings
+        #
+        self.cache_dir = self.settings.get(
+            "cache_dir", os.path.join(tempfile.gettempdir(), "bootstrap_git_mirror"),
+        )
+        #
+        self.temp_dirs = []
+        self.locks = {}
+        self.locks_lock = threading.Lock()
+
+    def init(self):
+        """ Initialize provider """
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def deinit(self):
+        """ De-initialize provider """
+        while self.temp_dirs:
+            shutil.rmtree(self.temp_dirs.pop(), ignore_errors=True)
+
+    def _get_lock(self, key):
+        with self.locks_lock:
+            if key not in self.locks:
+                self.locks[key] = threading.Lock()
+            #
+            return self.locks[key]
+
+    def _get_auth_env(self):
+        """ Auth header as git config from environment (not visible in argv / ps) """
+        username = self.settings.get("username", None)
+        password = self.settings.get("password", None)
+        #
+        if username is None:
+            return {}
+        #
+        credentials = base64.b64encode(
+            f"{username}:{password if password is not None else ''}".encode()
+        ).decode()
+        #
+        return {
+            "GIT_CONFIG_COUNT": "1",
+            "GIT_CONFIG_KEY_0": "http.extraHeader",
+            "GIT_CONFIG_VALUE_0": f"Authorization: Basic {credentials}",
+        }
+
+    def _git(self, *args, cwd=None, auth=False):
+        env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        #
+        if auth:
+            env.update(self._get_auth_env())
+        #
+        try:
+            subprocess.run(
+                ["git", *args],
+                cwd=cwd,
+                check=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env,
+            )
+        except subprocess.CalledProcessError as exception:
+            stderr = (exception.stderr or b"").decode(errors="replace").strip()
+            #
+            raise GitError(
+                f"{sanitize(' '.join(['git', *args]))} failed "
+                f"(return code {exception.returncode}): {sanitize(stderr[-1000:])}"
+            ) from None
+
+    def update_mirror(self, source_url):
+        """ Create or incrementally fetch bare mirror, return mirror path """
+        mirror_key = hashlib.sha256(source_url.encode()).hexdigest()[:32]
+        mirror_path = os.path.join(self.cache_dir, f"{mirror_key}.git")
+        with self._get_lock(mirror_key):
+            if os.path.isdir(mirror_path):
+                log.info("Fetching into git mirror: %s", sanitize(source_url))
+                #
+                try:
+                    self._git("fetch", "--prune", "origin", cwd=mirror_path, auth=True)
+                    return mirror_path
+                except GitError as exception:
+                    log.error(
+                        "Git mirror fetch failed, re-creating: %s (%s)",
+                        sanitize(source_url), exception,
+                    )
+                    shutil.rmtree(mirror_path, ignore_errors=True)
+            #
+            log.info("Creating git mirror: %s", sanitize(source_url))
+            #
+            temp_path = f"{mirror_path}.tmp"
+            shutil.rmtree(temp_path, ignore_errors=True)
+            #
+            self._git("clone", "--mirror", source_url, temp_path, auth=True)
+            os.replace(temp_path, mirror_path)
+        #
+        return mirror_path
+
+    def get_source(self, target):
+        """ Materialize source from mirror, return path """
+        source_url = target["source"]
+        branch = target.get("branch", self.settings.get("branch", "main"))
+        depth = self.settings.get("depth", None)
+        delete_git_dir = self.settings.get("delete_git_dir", False)
+        #
+        mirror_path = self.update_mirror(source_url)
+        #
+        target_dir = tempfile.mkdtemp(prefix="bootstrap_git_")
+        self.temp_dirs.append(target_dir)
+        #
+        if delete_git_dir:
+            archive_path = os.path.join(target_dir, ".source.tar")
+            #
+            self._git(
+                "--git-dir", mirror_path, "archive",
+                "--format=tar", "-o", archive_path, branch,
+            )
+            #
+            source_dir = os.path.join(target_dir, "source")
+            with tarfile.open(archive_path, mode="r") as tar_file:
+                tar_file.extractall(source_dir)
+            #
+            os.remove(archive_path)
+            return source_dir
+        #
+        source_dir = os.path.join(target_dir, "source")
+        #
+        if depth is not None:
+            self._git(
+                "clone", "--depth", str(depth), "--branch", branch,
+                f"file://{mirror_path}", source_dir,
+            )
+        else:
+            self._git(
+                "clone", "--reference", mirror_path, "--dissociate",
+                "--branch", branch, mirror_path, source_dir,
+            )
+        #
+        self._git("remote", "set-url", "origin", source_url, cwd=source_dir)
+        #
+        return source_dir
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Managed identity tokens """
+
+import time
+import threading
+import collections
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+
+DB_TOKEN_SCOPE = "https://ossrdbms-aad.database.windows.net/.default"
+
+AccessToken = collections.namedtuple("AccessToken", ["token", "expires_on"])
+
+
+class StaticCredential:  # pylint: disable=R0903
+    """ Local stand-in credential: fixed token, renewed expiry on each call """
+
+    def __init__(self, token, expires_in=3600):
+        self.token = token
+        self.expires_in = expires_in
+        self.calls = 0
+
+    def get_token(self, *scopes, **kwargs):  # pylint: disable=W0613
+        """ Get token """
+        self.calls += 1
+        return AccessToken(self.token, int(time.time() + self.expires_in))
+
+
+def default_credential():
+    """ Make default Azure credential """
+    from azure.identity import DefaultAzureCredential  # pylint: disable=E0401,C0415
+    return DefaultAzureCredential()
+
+
+class TokenCache:
+    """ Reuse token until shortly before expiry, refresh it in background """
+
+    def __init__(self, credential_factory, scope, refresh_margin=300, expiry_margin=30):
+        self.credential_factory = credential_factory
+        self.scope = scope
+        self.refresh_margin = refresh_margin
+        self.expiry_margin = expiry_margin
+        #
+        self.credential = None
+        self.credential_lock = threading.Lock()
+        self.access_token = None
+        #
+        self.lock = threading.Lock()
+        self.refreshing = False
+
+    def _fetch(self):
+        """ Get new token from credential (no token lock held) """
+        with self.credential_lock:
+            if self.credential is None:
+                self.credential = self.credential_factory()
+            #
+            credential = self.credential
+        #
+        access_token = credential.get_token(self.scope)
+        #
+        return AccessToken(access_token.token, access_token.expires_on)
+
+    def _background_refresh(self):
+        try:
+            access_token = self._fetch()
+            #
+            with self.lock:
+                self.access_token = access_token
+        except:  # pylint: disable=W0702
+            log.exception("Background token refresh failed, keeping current token")
+        finally:
+            with self.lock:
+                self.refreshing = False
+
+    def get_token(self):
+        """ Get token string """
+        with self.lock:
+            access_token = self.access_token
+            now = time.time()
+            #
+            if access_token is None or now >= access_token.expires_on - self.expiry_margin:
+                self.access_token = self._fetch()
+                return self.access_token.token
+            #
+            if now >= access_token.expires_on - self.refresh_margin and not self.refreshing:
+                self.refreshing = True
+                threading.Thread(target=self._background_refresh, daemon=True).start()
+            #
+            return access_token.token
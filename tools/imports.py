@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Deferred imports with import time accounting """
+
+import sys
+import time
+import importlib
+import importlib.util
+import threading
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+
+import_times = {}
+import_times_lock = threading.Lock()
+
+
+def record_import_time(name, seconds):
+    """ Record import time of name """
+    with import_times_lock:
+        import_times[name] = seconds
+
+
+def timed_import(name, package=None):
+    """ Import module on first use, record how long the first import took """
+    resolved = importlib.util.resolve_name(name, package) if name.startswith(".") else name
+    #
+    if resolved in sys.modules:
+        return sys.modules[resolved]
+    #
+    started = time.perf_counter()
+    result = importlib.import_module(resolved)
+    #
+    record_import_time(resolved, time.perf_counter() - started)
+    #
+    return result
+
+
+def log_import_report():
+    """ Log import times recorded so far """
+    with import_times_lock:
+        items = sorted(import_times.items(), key=lambda item: item[1], reverse=True)
+    #
+    if not items:
+        return
+    #
+    log.info(
+        "Import times: %s",
+        ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in items),
+    )
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Resolution lockfile """
+
+import os
+import json
+import hashlib
+import tempfile
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+
+LOCKFILE_VERSION = 1
+SKIP_DIRS = ["__pycache__", ".git"]
+
+
+def tree_digest(path):
+    """ Compute sha256 digest of directory tree (names and contents) """
+    if path is None or not os.path.isdir(path):
+        return None
+    #
+    digest = hashlib.sha256()
+    #
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(item for item in dirs if item not in SKIP_DIRS)
+        #
+        for file_name in sorted(files):
+            if file_name.endswith((".pyc", ".pyo")):
+                continue
+            #
+            file_path = os.path.join(root, file_name)
+            rel_path = os.path.relpath(file_path, path).replace(os.sep, "/")
+            #
+            digest.update(rel_path.encode())
+            digest.update(b"\0")
+            #
+            if os.path.islink(file_path):
+                digest.update(os.readlink(file_path).encode())
+            else:
+                with open(file_path, "rb") as file:
+                    while True:
+                        chunk = file.read(65536)
+                        if not chunk:
+                            break
+                        #
+                        digest.update(chunk)
+            #
+            digest.update(b"\0")
+    #
+    return f"sha256:{digest.hexdigest()}"
+
+
+def load_lockfile(path):
+    """ Load lockfile, return None if missing or invalid """
+    if path is None or not os.path.isfile(path):
+        return None
+    #
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except:  # pylint: disable=W0702
+        log.exception("Failed to load lockfile: %s", path)
+        return None
+    #
+    if not isinstance(data, dict) or data.get("version", None) != LOCKFILE_VERSION:
+        log.error("Unsupported lockfile format: %s", path)
+        return None
+    #
+    return data
+
+
+def save_lockfile(path, plugins):
+    """ Atomically write lockfile """
+    target_dir = os.path.dirname(os.path.abspath(path))
+    os.makedirs(target_dir, exist_ok=True)
+    #
+    data = {
+        "version": LOCKFILE_VERSION,
+        "plugins": plugins,
+    }
+    #
+    fd, temp_path = tempfile.mkstemp(prefix=".lock_", dir=target_dir)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=2, sort_keys=True)
+        #
+        os.replace(temp_path, path)
+    except:  # pylint: disable=W0702
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    #
+    log.info("Lockfile saved: %s", path)
@@ -20,6 +20,13 @@
 import logging
 import traceback
 
+from .metrics import registry
+
+
+dropped_lines = registry.counter(
+    "bootstrap_log_buffer_dropped_total", "Log lines dropped from debug log buffer",
+)
+
 
 class LocalListLogHandler(logging.Handler):
     """ Log handler - send logs to local list """
@@ -28,14 +35,44 @@ class LocalListLogHandler(logging.Handler):
         super().__init__()
         self.target_list = target_list
         self.max_size = max_size
+        #
+        self.sequence = 0
+
+    def get_since(self, cursor, limit=None):
+        """ Get lines emitted since cursor: (next cursor, lines, dropped count) """
+        # Same lock as emit() (taken by Handler.handle), keeps lines and sequence consistent
+        self.acquire()
+        try:
+            lines = list(self.target_list)
+            sequence = self.sequence
+        finally:
+            self.release()
+        #
+        first = sequence - len(lines)
+        #
+        if cursor > sequence:
+            # Stale cursor (pylon restart, debug re-enabled): restart from oldest retained
+            # line, lines rotated out before it are reported as dropped
+            cursor = 0
+        #
+        start = max(cursor, first)
+        dropped = start - cursor if cursor < first else 0
+        #
+        result = lines[start - first:]
+        if limit is not None:
+            result = result[:limit]
+        #
+        return start + len(result), result, dropped
 
     def emit(self, record):
         try:
             log_line = self.format(record)
             self.target_list.append(log_line)
+            self.sequence += 1
             #
             while len(self.target_list) > self.max_size:
                 self.target_list.pop(0)
+                dropped_lines.inc()
         except:  # pylint: disable=W0702
             # In this case we should NOT use logging to log logging error. Only print()
             print("[FATAL] Exception during sending logs")
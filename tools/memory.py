@@ -0,0 +1,148 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Memory accounting """
+
+import os
+import time
+import threading
+import tracemalloc
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+from .pycache import get_plugin_paths
+
+
+OTHER = "[other]"
+
+
+def get_process_memory():
+    """ Get process RSS/PSS/USS in bytes (None if not available) """
+    result = {
+        "rss": None,
+        "pss": None,
+        "uss": None,
+    }
+    #
+    try:
+        with open("/proc/self/smaps_rollup", "r", encoding="utf-8") as file:
+            values = {}
+            #
+            for line in file:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    values[parts[0][:-1]] = int(parts[1]) * 1024
+        #
+        result["rss"] = values.get("Rss", None)
+        result["pss"] = values.get("Pss", None)
+        result["uss"] = values.get("Private_Clean", 0) + values.get("Private_Dirty", 0)
+        #
+        return result
+    except:  # pylint: disable=W0702
+        pass
+    #
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as file:
+            result["rss"] = int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except:  # pylint: disable=W0702
+        pass
+    #
+    return result
+
+
+class MemoryTracer:
+    """ On-demand tracemalloc snapshots grouped by plugin path prefix """
+
+    def __init__(self, module):
+        self.module = module
+        self.lock = threading.Lock()
+        self.started_here = False
+        self.last = None
+
+    @property
+    def tracing(self):
+        """ Is tracemalloc running """
+        return tracemalloc.is_tracing()
+
+    def start(self, frames=1):
+        """ Start tracing """
+        if tracemalloc.is_tracing():
+            return
+        #
+        log.info("Starting memory tracing (%s frames)", frames)
+        tracemalloc.start(frames)
+        self.started_here = True
+
+    def stop(self):
+        """ Stop tracing (only if started by us), drop traces """
+        if not self.started_here:
+            return
+        #
+        log.info("Stopping memory tracing")
+        tracemalloc.stop()
+        self.started_here = False
+
+    def _get_prefixes(self):
+        module_manager = self.module.context.module_manager
+        prefixes = []
+        #
+        for plugin in list(module_manager.descriptors):
+            for path in get_plugin_paths(module_manager, plugin):
+                prefixes.append((path.rstrip(os.sep) + os.sep, plugin))
+        #
+        prefixes.sort(key=lambda item: len(item[0]), reverse=True)
+        return prefixes
+
+    def sample(self):
+        """ Take snapshot, return {time, traced, peak, plugins: {plugin: {size, count}}} """
+        if not tracemalloc.is_tracing():
+            return None
+        #
+        with self.lock:
+            started = time.perf_counter()
+            #
+            snapshot = tracemalloc.take_snapshot()
+            traced, peak = tracemalloc.get_traced_memory()
+            #
+            prefixes = self._get_prefixes()
+            resolved = {}
+            plugins = {}
+            #
+            for stat in snapshot.statistics("filename"):
+                filename = stat.traceback[0].filename
+                #
+                if filename not in resolved:
+                    resolved[filename] = OTHER
+                    #
+                    for prefix, plugin in prefixes:
+                        if filename.startswith(prefix):
+                            resolved[filename] = plugin
+                            break
+                #
+                item = plugins.setdefault(resolved[filename], {"size": 0, "count": 0})
+                item["size"] += stat.size
+                item["count"] += stat.count
+            #
+            self.last = {
+                "time": time.time(),
+                "duration": time.perf_counter() - started,
+                "traced": traced,
+                "peak": peak,
+                "plugins": plugins,
+            }
+            #
+            return self.last
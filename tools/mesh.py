@@ -17,23 +17,241 @@
 
 """ Mesh """
 
+import os
+import hashlib
+import threading
+import concurrent.futures
+
 from pylon.core.tools import log  # pylint: disable=E0611,E0401,W0611
 
+from .imports import import_times
+from .scheduler import scheduler
+
+
+FREEZE_SCAN_DEPTH = 4
+FREEZE_TIMEOUT = 30.0
+
+freeze_cache = {}
+freeze_pending = {}
+freeze_cache_lock = threading.Lock()
+freeze_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="bootstrap_freeze",
+)
 
-def get_plugin_frozen_requirements(plugin_name):  # pylint: disable=R0912,R0914,R0915
-    """ Mesh """
-    log.info("Starting")
+
+def _get_requirements_key(requirements_base):
+    """ Cheap state key of requirements dir: directory names and mtimes """
+    key = hashlib.sha256()
+    #
+    if requirements_base is None or not os.path.isdir(requirements_base):
+        return None
+    #
+    base_depth = requirements_base.rstrip(os.sep).count(os.sep)
+    #
+    for root, dirs, _ in os.walk(requirements_base):
+        dirs.sort()
+        #
+        try:
+            key.update(f"{root}:{os.stat(root).st_mtime_ns}\n".encode())
+        except OSError:
+            pass
+        #
+        if root.count(os.sep) - base_depth >= FREEZE_SCAN_DEPTH:
+            dirs[:] = []
     #
+    return key.hexdigest()
+
+
+def _freeze(plugin_name):
     from tools import context  # pylint: disable=C0415,E0401
     #
     module_descriptor = context.module_manager.descriptors[plugin_name]
+    requirements_base = module_descriptor.requirements_base
+    #
+    requirements_key = _get_requirements_key(requirements_base)
+    #
+    with freeze_cache_lock:
+        cached = freeze_cache.get(plugin_name, None)
     #
-    log.info("Module %s descriptor: %s", plugin_name, module_descriptor)
+    if cached is not None and requirements_key is not None and cached[0] == requirements_key:
+        return cached[1]
+    #
+    log.info("Freezing requirements of %s", plugin_name)
     #
     frozen_requirements = context.module_manager.freeze_site_requirements(
-        target_site_base=module_descriptor.requirements_base,
+        target_site_base=requirements_base,
     )
     #
-    log.info("Done")
+    with freeze_cache_lock:
+        freeze_cache[plugin_name] = (requirements_key, frozen_requirements)
     #
     return frozen_requirements
+
+
+def _get_cached(plugin_name):
+    with freeze_cache_lock:
+        cached = freeze_cache.get(plugin_name, None)
+    #
+    return cached[1] if cached is not None else None
+
+
+def _submit_freeze(plugin_name):
+    """ Start (or join in-flight) freeze of plugin on freeze_executor """
+    with freeze_cache_lock:
+        future = freeze_pending.get(plugin_name, None)
+        created = future is None
+        #
+        if created:
+            future = freeze_executor.submit(_freeze, plugin_name)
+            freeze_pending[plugin_name] = future
+    #
+    if created:
+        def _forget(_):
+            with freeze_cache_lock:
+                if freeze_pending.get(plugin_name, None) is future:
+                    freeze_pending.pop(plugin_name)
+        #
+        future.add_done_callback(_forget)
+    #
+    return future
+
+
+def get_plugin_frozen_requirements(plugin_name):
+    """ Mesh: scan runs on freeze_executor, wait is bounded by FREEZE_TIMEOUT """
+    future = _submit_freeze(plugin_name)
+    #
+    try:
+        return future.result(timeout=FREEZE_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        cached = _get_cached(plugin_name)
+        #
+        if cached is None:
+            raise
+        #
+        log.warning(
+            "Freezing requirements of %s takes over %ss, returning cached result",
+            plugin_name, FREEZE_TIMEOUT,
+        )
+        return cached
+
+
+def get_plugins_frozen_requirements(plugin_names):
+    """ Mesh: frozen requirements for many plugins, errors are reported per plugin """
+    futures = {
+        plugin_name: _submit_freeze(plugin_name)
+        for plugin_name in plugin_names
+    }
+    #
+    concurrent.futures.wait(futures.values(), timeout=FREEZE_TIMEOUT)
+    #
+    result = {}
+    #
+    for plugin_name, future in futures.items():
+        if not future.done():
+            cached = _get_cached(plugin_name)
+            #
+            log.warning("Freezing requirements of %s timed out", plugin_name)
+            result[plugin_name] = {
+                "ok": cached is not None, "requirements": cached, "stale": True,
+            }
+            continue
+        #
+        try:
+            result[plugin_name] = {"ok": True, "requirements": future.result()}
+        except:  # pylint: disable=W0702
+            log.exception("Failed to freeze requirements of %s", plugin_name)
+            result[plugin_name] = {"ok": False, "requirements": None}
+    #
+    return result
+
+
+def get_plugin_runtime_info(module, plugin_name, light=False):
+    """ Mesh: runtime info of one plugin """
+    if module.announcer is None:
+        return None
+    #
+    return module.announcer.collect_plugin_info(plugin_name, light)
+
+
+def get_log_tail(module, cursor=0, limit=1000):
+    """ Mesh: log lines emitted since cursor (debug mode log buffer) """
+    if module.log_handler is None:
+        return {
+            "enabled": False,
+            "cursor": cursor,
+            "lines": [],
+            "dropped": 0,
+        }
+    #
+    next_cursor, lines, dropped = module.log_handler.get_since(cursor, limit)
+    #
+    return {
+        "enabled": True,
+        "cursor": next_cursor,
+        "lines": lines,
+        "dropped": dropped,
+    }
+
+
+def get_profiling_snapshot(module):
+    """ Mesh: profiling state """
+    profiling = getattr(module.context, "profiling", {})
+    #
+    sampler = getattr(module, "sampler", None)
+    blocking_monitor = getattr(module, "blocking_monitor", None)
+    #
+    return {
+        "stages": dict(profiling.get("stage", {})),
+        "sampling": sampler.snapshot(top=50) if sampler is not None else None,
+        "blocking": blocking_monitor.report(top=50) if blocking_monitor is not None else None,
+        "imports": dict(import_times),
+    }
+
+
+def get_sampled_profile(module, reset=False):
+    """ Mesh: sampling profiler data in collapsed-stack format """
+    sampler = getattr(module, "sampler", None)
+    #
+    if sampler is None:
+        return None
+    #
+    return sampler.collapsed(reset=reset)
+
+
+def get_drain_status(module):
+    """ Mesh: task drain status """
+    return dict(module.drain_status)
+
+
+def get_download_scheduler_status(module):  # pylint: disable=W0613
+    """ Mesh: download scheduler slots, queue depth and limits """
+    return scheduler.status()
+
+
+def get_retry_metrics(module):  # pylint: disable=W0613
+    """ Mesh: retry policy attempts, waits and circuit states """
+    from .retry import get_retry_metrics as _get_retry_metrics  # pylint: disable=C0415
+    return _get_retry_metrics()
+
+
+def get_metrics(module, output_format="text"):  # pylint: disable=W0613
+    """ Mesh: metrics in text exposition format (or dict snapshot) """
+    from .metrics import registry  # pylint: disable=C0415
+    #
+    if output_format == "text":
+        return registry.render()
+    #
+    return registry.snapshot()
+
+
+def get_memory_snapshot(module, sample=True):
+    """ Mesh: process memory and per-plugin allocations (if tracing is enabled) """
+    from .memory import get_process_memory  # pylint: disable=C0415
+    #
+    tracer = module.memory_tracer
+    #
+    return {
+        "process": get_process_memory(),
+        "tracing": tracer.tracing,
+        "allocations": tracer.sample() if sample else tracer.last,
+    }
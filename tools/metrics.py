@@ -0,0 +1,262 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Metrics: counters, gauges, histograms and text exposition """
+
+import time
+import bisect
+import threading
+import contextlib
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _labels_key(labels):
+    if not labels:
+        return ()
+    #
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(key):
+    if not key:
+        return ""
+    #
+    values = ",".join(f'{name}="{_escape(value)}"' for name, value in key)
+    #
+    return "{" + values + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    #
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    #
+    return str(value)
+
+
+class Counter:
+    """ Monotonic counter """
+    kind = "counter"
+
+    def __init__(self, name, description=""):
+        self.name = name
+        self.description = description
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, value=1, **labels):
+        """ Increment """
+        key = _labels_key(labels)
+        #
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def samples(self):
+        """ Get [(name, labels key, value)] """
+        with self.lock:
+            return [(self.name, key, value) for key, value in self.values.items()]
+
+
+class Gauge(Counter):
+    """ Value that can go up and down """
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        """ Set """
+        key = _labels_key(labels)
+        #
+        with self.lock:
+            self.values[key] = value
+
+
+class Histogram:
+    """ Cumulative-bucket histogram """
+    kind = "histogram"
+
+    def __init__(self, name, description="", buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """ Add observation """
+        key = _labels_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        #
+        with self.lock:
+            item = self.values.get(key, None)
+            if item is None:
+                item = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            #
+            item[0][index] += 1
+            item[1] += value
+            item[2] += 1
+
+    @contextlib.contextmanager
+    def time(self, **labels):
+        """ Observe duration of block """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        """ Get [(name, labels key, value)] """
+        result = []
+        #
+        with self.lock:
+            items = [(key, list(item[0]), item[1], item[2]) for key, item in self.values.items()]
+        #
+        for key, counts, total, count in items:
+            cumulative = 0
+            #
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                result.append(
+                    (f"{self.name}_bucket", key + (("le", _format_value(bound)),), cumulative)
+                )
+            #
+            result.append((f"{self.name}_sum", key, total))
+            result.append((f"{self.name}_count", key, count))
+        #
+        return result
+
+
+class MetricsRegistry:
+    """ Named metrics and extra collectors """
+
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+        self.lock = threading.Lock()
+
+    def _get(self, cls, name, *args, **kwargs):
+        with self.lock:
+            if name not in self.metrics:
+                self.metrics[name] = cls(name, *args, **kwargs)
+            #
+            return self.metrics[name]
+
+    def counter(self, name, description=""):
+        """ Get or create counter """
+        return self._get(Counter, name, description)
+
+    def gauge(self, name, description=""):
+        """ Get or create gauge """
+        return self._get(Gauge, name, description)
+
+    def histogram(self, name, description="", buckets=DEFAULT_BUCKETS):
+        """ Get or create histogram """
+        return self._get(Histogram, name, description, buckets)
+
+    def add_collector(self, collector):
+        """ Add callable returning [(name, kind, description, [(sample name, labels, value)])] """
+        with self.lock:
+            if collector not in self.collectors:
+                self.collectors.append(collector)
+
+    def collect(self):
+        """ Get [(name, kind, description, samples)] """
+        with self.lock:
+            metrics = list(self.metrics.values())
+            collectors = list(self.collectors)
+        #
+        result = [
+            (metric.name, metric.kind, metric.description, metric.samples())
+            for metric in metrics
+        ]
+        #
+        for collector in collectors:
+            try:
+                result.extend(collector())
+            except:  # pylint: disable=W0702
+                log.exception("Metrics collector failed, skipping")
+        #
+        return result
+
+    def render(self):
+        """ Render text exposition format """
+        lines = []
+        #
+        for name, kind, description, samples in self.collect():
+            if description:
+                lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            #
+            for sample_name, key, value in samples:
+                lines.append(f"{sample_name}{_format_labels(key)} {_format_value(value)}")
+        #
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """ Get {name: {sample: value}} """
+        result = {}
+        #
+        for name, _, _, samples in self.collect():
+            result[name] = {
+                f"{sample_name}{_format_labels(key)}": value
+                for sample_name, key, value in samples
+            }
+        #
+        return result
+
+
+registry = MetricsRegistry()
+
+
+def collect_retry_metrics():
+    """ Collector: retry policies """
+    from .retry import get_retry_metrics  # pylint: disable=C0415
+    #
+    policies = get_retry_metrics()
+    #
+    def _samples(key):
+        return [
+            (f"bootstrap_retry_{key}", (("policy", name),), float(item[key]))
+            for name, item in policies.items()
+        ]
+    #
+    return [
+        ("bootstrap_retry_attempts", "counter", "Retry policy attempts", _samples("attempts")),
+        ("bootstrap_retry_failed", "counter", "Retried operations that failed", _samples("failed")),
+        ("bootstrap_retry_rejected", "counter", "Calls rejected by open circuit", _samples("rejected")),
+        ("bootstrap_retry_wait_seconds", "counter", "Time spent in backoff", _samples("wait_seconds")),
+        ("bootstrap_retry_circuit_open", "gauge", "Circuit is open", [
+            (
+                "bootstrap_retry_circuit_open",
+                (("policy", name),),
+                1 if item["state"] == "open" else 0,
+            )
+            for name, item in policies.items()
+        ]),
+    ]
+
+
+registry.add_collector(collect_retry_metrics)
@@ -0,0 +1,216 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Mesh plugin mirror """
+
+import io
+import os
+import time
+import shutil
+import tarfile
+import tempfile
+import threading
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+from .lock import tree_digest
+from .scheduler import scheduler, PRIORITY_MIRROR
+
+
+def get_service_prefix(mirror_config):
+    """ Get mesh service name prefix for mirror """
+    return f"mesh:service:mirror:{mirror_config.get('name', 'default')}"
+
+
+def _extract_tar(tar_file, target_dir):
+    if hasattr(tarfile, "data_filter"):
+        tar_file.extractall(target_dir, filter="data")  # pylint: disable=E1123
+    else:
+        tar_file.extractall(target_dir)
+
+
+class MeshMirror:
+    """ Serve resolved plugin metadata and sources to peer pylons """
+
+    def __init__(self, module, config):
+        self.module = module
+        self.config = config
+        #
+        self.cache_dir = self.config.get(
+            "cache_dir", os.path.join(tempfile.gettempdir(), "bootstrap_mesh_mirror"),
+        )
+        self.metadata_ttl = self.config.get("metadata_ttl", 300)
+        #
+        self.entries = {}
+        self.locks = {}
+        self.lock = threading.Lock()
+
+    def _get_lock(self, plugin):
+        with self.lock:
+            if plugin not in self.locks:
+                self.locks[plugin] = threading.Lock()
+            #
+            return self.locks[plugin]
+
+    def _get_services(self):
+        prefix = get_service_prefix(self.config)
+        #
+        return [
+            (self.get_plugin, f"{prefix}:get_plugin"),
+            (self.get_plugin_source, f"{prefix}:get_plugin_source"),
+        ]
+
+    def register(self, service_node):
+        """ Register mesh services """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        #
+        for callback, name in self._get_services():
+            service_node.register(callback=callback, name=name)
+
+    def unregister(self, service_node):
+        """ Unregister mesh services """
+        for callback, name in self._get_services():
+            service_node.unregister(callback=callback, name=name)
+
+    def _cache_plugin(self, plugin):
+        if self.module.repo_resolver is None:
+            return None
+        #
+        found = self.module.repo_resolver.find(plugin, cached=False)
+        if found is None:
+            return None
+        #
+        resolver, plugin_info = found
+        #
+        source_target = plugin_info["source"].copy()
+        source_type = source_target.pop("type")
+        #
+        if source_type not in ["git", "http_tar", "http_zip"]:
+            return None
+        #
+        metadata = resolver.metadata_provider.get_metadata(
+            {"source": plugin_info["objects"]["metadata"]}
+        )
+        #
+        entry = self.entries.get(plugin, None)
+        #
+        if entry is not None and os.path.exists(entry["archive"]) and \
+                entry["metadata"].get("version", None) == metadata.get("version", None):
+            entry["metadata"] = metadata
+            entry["time"] = time.time()
+            return entry
+        #
+        log.info("Mirror: fetching plugin %s from upstream", plugin)
+        #
+        with scheduler.slot(source_target.get("source", None), PRIORITY_MIRROR):
+            source = resolver.source_provider.get_source(source_target)
+        #
+        digest = tree_digest(source)
+        #
+        archive = os.path.join(self.cache_dir, f"{plugin}-{digest.split(':')[-1]}.tar.gz")
+        #
+        if not os.path.exists(archive):
+            temp_archive = f"{archive}.tmp"
+            #
+            with tarfile.open(temp_archive, mode="w:gz") as tar_file:
+                for item in sorted(os.listdir(source)):
+                    if item in ["__pycache__"]:
+                        continue
+                    #
+                    tar_file.add(os.path.join(source, item), arcname=item)
+            #
+            os.replace(temp_archive, archive)
+        #
+        if entry is not None and entry["archive"] != archive and os.path.exists(entry["archive"]):
+            os.remove(entry["archive"])
+        #
+        entry = {
+            "metadata": metadata,
+            "digest": digest,
+            "archive": archive,
+            "time": time.time(),
+        }
+        self.entries[plugin] = entry
+        #
+        return entry
+
+    def get_plugin(self, plugin):
+        """ Mesh: get plugin metadata and source digest """
+        with self._get_lock(plugin):
+            entry = self.entries.get(plugin, None)
+            #
+            if entry is None or time.time() - entry["time"] >= self.metadata_ttl:
+                try:
+                    entry = self._cache_plugin(plugin)
+                except:  # pylint: disable=W0702
+                    log.exception("Mirror: failed to cache plugin %s", plugin)
+                    entry = None
+            #
+            if entry is None:
+                return None
+            #
+            return {
+                "metadata": entry["metadata"],
+                "digest": entry["digest"],
+            }
+
+    def get_plugin_source(self, plugin, digest):
+        """ Mesh: get plugin source archive (tar.gz bytes) by digest """
+        entry = self.entries.get(plugin, None)
+        #
+        if entry is None or entry["digest"] != digest or not os.path.exists(entry["archive"]):
+            return None
+        #
+        with open(entry["archive"], "rb") as file:
+            return file.read()
+
+
+def fetch_from_mirror(service_node, mirror_config, plugin):
+    """ Get (metadata, source path) of plugin from mesh mirror, (None, None) on miss """
+    prefix = get_service_prefix(mirror_config)
+    timeout = mirror_config.get("timeout", 120)
+    #
+    try:
+        info = service_node.call_with_timeout(f"{prefix}:get_plugin", timeout, plugin)
+        if not info:
+            return None, None
+        #
+        data = service_node.call_with_timeout(
+            f"{prefix}:get_plugin_source", timeout, plugin, info["digest"],
+        )
+        if not data:
+            return None, None
+    except:  # pylint: disable=W0702
+        log.exception("Mirror request failed for plugin %s, using upstream", plugin)
+        return None, None
+    #
+    target_dir = tempfile.mkdtemp(prefix="bootstrap_mirror_")
+    #
+    try:
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as tar_file:
+            _extract_tar(tar_file, target_dir)
+        #
+        digest = tree_digest(target_dir)
+        if digest != info["digest"]:
+            raise RuntimeError(f"Digest mismatch: expected {info['digest']}, got {digest}")
+    except:  # pylint: disable=W0702
+        log.exception("Mirror source for plugin %s is not usable, using upstream", plugin)
+        shutil.rmtree(target_dir, ignore_errors=True)
+        return None, None
+    #
+    log.info("Plugin %s fetched from mesh mirror", plugin)
+    return info["metadata"], target_dir
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Pycache """
+
+import os
+import shutil
+import compileall
+import threading
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+
+def get_plugin_paths(module_manager, plugin, source=True, site=True):
+    """ Get source and/or site-packages paths of plugin """
+    result = []
+    #
+    descriptor = module_manager.descriptors.get(plugin, None)
+    #
+    if source:
+        plugins_path = getattr(module_manager.providers["plugins"], "path", None)
+        if plugins_path is not None:
+            result.append(os.path.join(plugins_path, plugin))
+        #
+        if descriptor is not None:
+            result.append(getattr(descriptor, "path", None))
+    #
+    if site:
+        requirements_path = getattr(module_manager.providers["requirements"], "path", None)
+        if requirements_path is not None:
+            result.append(os.path.join(requirements_path, plugin))
+        #
+        if descriptor is not None:
+            result.append(getattr(descriptor, "requirements_base", None))
+    #
+    paths = []
+    #
+    for path in result:
+        if not isinstance(path, str):
+            continue
+        #
+        for item in [os.path.abspath(path), os.path.realpath(path)]:
+            if item not in paths:
+                paths.append(item)
+    #
+    return paths
+
+
+def invalidate_pycache(pycache_path, paths):
+    """ Remove cached bytecode of paths from pycache prefix tree """
+    if pycache_path is None:
+        return
+    #
+    for path in paths:
+        cache_path = os.path.join(pycache_path, os.path.abspath(path).lstrip(os.sep))
+        #
+        if not os.path.exists(cache_path):
+            continue
+        #
+        log.info("Invalidating pycache: %s", cache_path)
+        #
+        try:
+            if os.path.isdir(cache_path):
+                shutil.rmtree(cache_path)
+            else:
+                os.remove(cache_path)
+        except:  # pylint: disable=W0702
+            log.exception("Failed to invalidate pycache: %s", cache_path)
+
+
+def precompile(paths, workers=1):
+    """ Compile bytecode for paths (workers: 1 = in-process, 0 = CPU count process pool) """
+    for path in paths:
+        if not os.path.isdir(path):
+            continue
+        #
+        log.info("Precompiling: %s", path)
+        #
+        try:
+            compileall.compile_dir(path, quiet=1, workers=workers)
+        except:  # pylint: disable=W0702
+            log.exception("Failed to precompile: %s", path)
+
+
+def start_precompile(paths, workers=1):
+    """ Run precompile() in background thread, return thread """
+    thread = threading.Thread(
+        target=precompile,
+        args=(paths, workers),
+        daemon=True,
+    )
+    thread.start()
+    #
+    return thread
@@ -22,12 +22,28 @@ import importlib
 
 from pylon.core.tools import log  # pylint: disable=E0611,E0401,W0611
 
+from .download import get_metadata_digest
+from .retry import get_policy, is_unavailable_error
+from .metrics import registry
+
+
+resolver_lookups = registry.counter(
+    "bootstrap_resolver_lookups_total", "Plugin resolution requests by result",
+)
+
+
+LOCAL_PROVIDERS = {
+    "bootstrap.source.http": f"{__package__}.source",
+    "bootstrap.source.git_mirror": f"{__package__}.git_mirror",
+}
+
 
 class RepoResolver:
     """ Repo resolver """
 
-    def __init__(self, module, repo_config):
+    def __init__(self, module, repo_config, repo_id=""):
         self.module = module
+        self.repo_id = repo_id
         self.repo_config = self._expand_meta_repos(repo_config)
         #
         self.sub_resolvers = []
@@ -37,6 +53,9 @@ class RepoResolver:
         #
         self.lookup = self._local_lookup
         self.lookup_data = None
+        self.lookup_policy = None
+        #
+        self.resolved = {}
 
     def _expand_meta_repos(self, repo_config):  # pylint: disable=R0914
         if not isinstance(repo_config, dict):
@@ -65,6 +84,19 @@ class RepoResolver:
             #
             result = []
             #
+            if config.get("resumable_downloads", False):
+                source_provider = {
+                    "type": "bootstrap.source.http",
+                    "retries": config.get("download_retries", 5),
+                    "backoff": config.get("download_backoff", 1.0),
+                    **provider_auth,
+                }
+            else:
+                source_provider = {
+                    "type": "pylon.core.providers.source.http_tar",
+                    **provider_auth,
+                }
+            #
             result.append({
                 "type": "depot",
                 "url": depot_url,
@@ -73,9 +105,10 @@ class RepoResolver:
                     "type": "pylon.core.providers.metadata.http",
                     **provider_auth,
                 },
-                "source_provider": {
-                    "type": "pylon.core.providers.source.http_tar",
-                    **provider_auth,
+                "source_provider": source_provider,
+                **{
+                    key: value for key, value in config.items()
+                    if key.startswith("retry_")
                 },
             })
             #
@@ -108,19 +141,20 @@ class RepoResolver:
             license_password = config.get("license_password", None)
             add_source_data = config.get("add_source_data", False)
             add_head_data = config.get("add_head_data", False)
+            git_mirror_cache = config.get("git_mirror_cache", None)
             #
-            result = []
-            #
-            result.append({
-                "type": "github",
-                "namespace": "ProjectAlita",
-                "branch": release,
-                "metadata_provider": {
-                    "type": "pylon.core.providers.metadata.http",
+            if git_mirror_cache is not None and not add_source_data and not add_head_data:
+                source_provider = {
+                    "type": "bootstrap.source.git_mirror",
+                    "cache_dir": git_mirror_cache,
+                    "delete_git_dir": config.get("delete_git_dir", False),
+                    "branch": release,
+                    "depth": config.get("git_depth", None),
                     "username": license_username,
                     "password": license_password,
-                },
-                "source_provider": {
+                }
+            else:
+                source_provider = {
                     "type": "pylon.core.providers.source.git",
                     "delete_git_dir": False,
                     "add_source_data": add_source_data,
@@ -129,28 +163,32 @@ class RepoResolver:
                     "depth": None,
                     "username": license_username,
                     "password": license_password,
-                },
-            })
+                }
+            #
+            result = []
             #
             result.append({
                 "type": "github",
-                "namespace": "centry-core",
+                "namespace": "ProjectAlita",
                 "branch": release,
                 "metadata_provider": {
                     "type": "pylon.core.providers.metadata.http",
                     "username": license_username,
                     "password": license_password,
                 },
-                "source_provider": {
-                    "type": "pylon.core.providers.source.git",
-                    "delete_git_dir": False,
-                    "add_source_data": add_source_data,
-                    "add_head_data": add_head_data,
-                    "branch": release,
-                    "depth": None,
+                "source_provider": source_provider,
+            })
+            #
+            result.append({
+                "type": "github",
+                "namespace": "centry-core",
+                "branch": release,
+                "metadata_provider": {
+                    "type": "pylon.core.providers.metadata.http",
                     "username": license_username,
                     "password": license_password,
                 },
+                "source_provider": source_provider,
             })
             #
             return result
@@ -177,9 +215,12 @@ class RepoResolver:
         try:
             metadata_url = f"{url}/depot/{group}/plugins/{plugin}/metadata"
             #
-            self.metadata_provider.get_metadata({"source": metadata_url})
+            metadata = self.lookup_policy.call(
+                self.metadata_provider.get_metadata, {"source": metadata_url},
+                retry_if=is_unavailable_error,
+            )
             #
-            return {
+            result = {
                 "source": {
                     "type": "http_tar",
                     "source": f"{url}/depot/{group}/plugins/{plugin}/source",
@@ -188,6 +229,12 @@ class RepoResolver:
                     "metadata": metadata_url
                 }
             }
+            #
+            digest = get_metadata_digest(metadata)
+            if digest is not None:
+                result["source"]["digest"] = digest
+            #
+            return result
         except:  # pylint: disable=W0702
             pass
         #
@@ -316,8 +363,11 @@ class RepoResolver:
     def init(self):  # pylint: disable=R0912
         """ Init resolver """
         if isinstance(self.repo_config, list):
-            for config in self.repo_config:
-                sub_resolver = RepoResolver(self.module, config)
+            for idx, config in enumerate(self.repo_config):
+                sub_resolver = RepoResolver(
+                    self.module, config,
+                    repo_id=f"{self.repo_id}.{idx}" if self.repo_id else str(idx),
+                )
                 sub_resolver.init()
                 self.sub_resolvers.append(sub_resolver)
             #
@@ -345,6 +395,12 @@ class RepoResolver:
         elif repo_type == "depot":
             log.info("Using depot plugin repository")
             self.lookup = self._depot_lookup
+            self.lookup_policy = get_policy(
+                f"repo_depot:{self.repo_id}", self.repo_config,
+                max_attempts=4,
+                max_delay=10.0,
+                failure_threshold=10,
+            )
         #
         elif repo_type == "github":
             log.info("Using GitHub plugin repository")
@@ -384,6 +440,14 @@ class RepoResolver:
         # Source
         #
         source_config = self.repo_config.get("source_provider", None)
+        if source_config is None and self.repo_config.get("git_mirror_cache", None) is not None:
+            source_config = {
+                "type": "bootstrap.source.git_mirror",
+                "cache_dir": self.repo_config["git_mirror_cache"],
+                "delete_git_dir": self.repo_config.get("delete_git_dir", False),
+                "depth": self.repo_config.get("git_depth", None),
+            }
+        #
         if source_config is None:
             source_config = {
                 "type": "pylon.core.providers.source.git",
@@ -393,47 +457,90 @@ class RepoResolver:
         #
         source_config = source_config.copy()
         source_provider_type = source_config.pop("type")
+        source_provider_type = LOCAL_PROVIDERS.get(source_provider_type, source_provider_type)
         #
         self.source_provider = importlib.import_module(
             source_provider_type
         ).Provider(self.module.context, source_config)
         self.source_provider.init()
 
+    def find(self, plugin, cached=True):
+        """ Find (resolver, plugin info) for plugin, positive results are cached """
+        if cached and plugin in self.resolved:
+            if not self.repo_id:
+                resolver_lookups.inc(result="cached")
+            #
+            return self.resolved[plugin]
+        #
+        result = None
+        #
+        for sub_resolver in self.sub_resolvers:
+            result = sub_resolver.find(plugin, cached)
+            if result is not None:
+                break
+        else:
+            plugin_info = self.lookup(plugin)
+            if plugin_info is not None:
+                result = (self, plugin_info)
+        #
+        if cached and result is not None:
+            self.resolved[plugin] = result
+        #
+        if not self.repo_id:
+            resolver_lookups.inc(result="hit" if result is not None else "miss")
+        #
+        return result
+
+    def get_resolver(self, repo_id):
+        """ Get (sub-)resolver by repo ID """
+        if repo_id == self.repo_id:
+            return self
+        #
+        for sub_resolver in self.sub_resolvers:
+            if repo_id == sub_resolver.repo_id or \
+                    repo_id.startswith(f"{sub_resolver.repo_id}."):
+                return sub_resolver.get_resolver(repo_id)
+        #
+        return None
+
     def resolve(self, plugin):
         """ Resolve plugin """
-        for sub_resolver in self.sub_resolvers:
-            sub_result = sub_resolver.resolve(plugin)
-            if sub_result is not None:
-                return sub_result
+        result = self.find(plugin)
         #
-        return self.lookup(plugin)
+        if result is None:
+            return None
+        #
+        return result[1]
 
     def get_metadata_provider(self, plugin):
         """ Get metadata provider for plugin """
-        for sub_resolver in self.sub_resolvers:
-            sub_result = sub_resolver.get_metadata_provider(plugin)
-            if sub_result is not None:
-                return sub_result
+        result = self.find(plugin)
         #
-        if self.lookup(plugin) is None:
+        if result is None:
             return None
         #
-        return self.metadata_provider
+        return result[0].metadata_provider
 
     def get_source_provider(self, plugin):
         """ Get source provider for plugin """
-        for sub_resolver in self.sub_resolvers:
-            sub_result = sub_resolver.get_source_provider(plugin)
-            if sub_result is not None:
-                return sub_result
+        result = self.find(plugin)
         #
-        if self.lookup(plugin) is None:
+        if result is None:
             return None
         #
-        return self.source_provider
+        return result[0].source_provider
+
+    def clear_cache(self):
+        """ Drop cached lookup results (only valid for one preload/init walk) """
+        self.resolved.clear()
+        #
+        for sub_resolver in self.sub_resolvers:
+            sub_resolver.clear_cache()
 
     def deinit(self):
         """ De-init resolver """
+        self.resolved.clear()
+        #
         while self.sub_resolvers:
             sub_resolver = self.sub_resolvers.pop(0)
             sub_resolver.deinit()
@@ -0,0 +1,332 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Retry policy: exponential backoff, jitter, deadline, circuit breaker """
+
+import time
+import random
+import threading
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+
+policies = {}  # name -> latest policy made by get_policy (for metrics)
+policies_lock = threading.Lock()
+
+
+class CircuitOpenError(RuntimeError):
+    """ Circuit breaker is open: calls are rejected without trying """
+
+
+class TransientError(IOError):
+    """ Base for errors that are always worth retrying """
+
+
+def is_transient_error(exception):
+    """ Check if error is worth retrying: connection errors, timeouts, HTTP 5xx / 408 / 429 """
+    import requests  # pylint: disable=E0401,C0415
+    #
+    if isinstance(exception, (
+            TransientError, ConnectionError, TimeoutError,
+            requests.exceptions.ChunkedEncodingError,
+    )):
+        return True
+    #
+    return is_unavailable_error(exception)
+
+
+def is_unavailable_error(exception):
+    """ Check if error means service is (temporarily) unavailable, not a negative answer """
+    import requests  # pylint: disable=E0401,C0415
+    #
+    if isinstance(exception, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    #
+    response = getattr(exception, "response", None)
+    status_code = getattr(response, "status_code", 0) or 0
+    #
+    return status_code >= 500 or status_code in [408, 429]
+
+
+class RetryState:
+    """ Attempts of one retried operation """
+
+    def __init__(self, policy, initial_delay=None, max_attempts=None, deadline=None):
+        self.policy = policy
+        self.initial_delay = initial_delay if initial_delay is not None else policy.initial_delay
+        self.max_attempts = max_attempts if max_attempts is not None else policy.max_attempts
+        self.deadline = deadline if deadline is not None else policy.deadline
+        #
+        self.started = time.monotonic()
+        self.attempt = 0
+        self.waited = 0.0
+
+    def remaining(self):
+        """ Seconds left until deadline (None if no deadline) """
+        if self.deadline is None:
+            return None
+        #
+        return self.deadline - (time.monotonic() - self.started)
+
+    def next_delay(self):
+        """ Register failed attempt, return delay before next one or None if exhausted """
+        self.attempt += 1
+        self.policy.record_failure()
+        #
+        if self.max_attempts is not None and self.attempt >= self.max_attempts:
+            self.policy.record_result(self, False)
+            return None
+        #
+        delay = self.policy.get_delay(self.attempt, self.initial_delay)
+        remaining = self.remaining()
+        #
+        if remaining is not None:
+            if remaining <= 0:
+                self.policy.record_result(self, False)
+                return None
+            #
+            delay = min(delay, remaining)
+        #
+        return delay
+
+    def sleep(self, delay, stop_event=None):
+        """ Wait before next attempt, return False if stop_event was set """
+        self.waited += delay
+        self.policy.record_wait(delay)
+        #
+        if stop_event is not None:
+            return not stop_event.wait(delay)
+        #
+        time.sleep(delay)
+        return True
+
+    def failed(self):
+        """ Register non-retryable failure (does not count towards circuit breaker) """
+        self.attempt += 1
+        self.policy.record_failure(transient=False)
+        self.policy.record_result(self, False)
+
+    def succeeded(self):
+        """ Register successful attempt """
+        self.attempt += 1
+        self.policy.record_success()
+        self.policy.record_result(self, True)
+
+
+class CircuitState:  # pylint: disable=R0903
+    """ Circuit breaker state and metrics, shared by all policies of one name """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.consecutive_failures = 0
+        self.opened_at = None
+        #
+        self.metrics = {
+            "calls": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "rejected": 0,
+            "attempts": 0,
+            "wait_seconds": 0.0,
+            "circuit_opened": 0,
+        }
+
+
+class RetryPolicy:  # pylint: disable=R0902
+    """ Retry policy (backoff, attempts, deadline) with shared circuit breaker state """
+
+    def __init__(  # pylint: disable=R0913
+            self, name,
+            initial_delay=1.0,
+            max_delay=30.0,
+            multiplier=2.0,
+            jitter=0.5,
+            max_attempts=None,
+            deadline=None,
+            failure_threshold=None,
+            reset_timeout=30.0,
+            circuit=None,
+        ):
+        self.name = name
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_attempts = max_attempts
+        self.deadline = deadline
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        #
+        self.circuit = circuit if circuit is not None else CircuitState()
+
+    @classmethod
+    def from_config(cls, name, config, circuit=None, **defaults):
+        """ Make policy from config dict (retry_* keys), using defaults for missing keys """
+        settings = defaults.copy()
+        #
+        for key in [
+                "initial_delay", "max_delay", "multiplier", "jitter",
+                "max_attempts", "deadline", "failure_threshold", "reset_timeout",
+        ]:
+            if f"retry_{key}" in config:
+                settings[key] = config[f"retry_{key}"]
+        #
+        return cls(name, circuit=circuit, **settings)
+
+    def get_delay(self, attempt, initial_delay=None):
+        """ Backoff delay after failed attempt number N (1-based), with jitter """
+        if initial_delay is None:
+            initial_delay = self.initial_delay
+        #
+        delay = min(initial_delay * (self.multiplier ** (attempt - 1)), self.max_delay)
+        #
+        if self.jitter:
+            delay -= delay * self.jitter * random.random()
+        #
+        return delay
+
+    @property
+    def state(self):
+        """ Circuit state: closed, open or half_open """
+        with self.circuit.lock:
+            if self.circuit.opened_at is None:
+                return "closed"
+            #
+            if time.monotonic() - self.circuit.opened_at >= self.reset_timeout:
+                return "half_open"
+            #
+            return "open"
+
+    def begin(self, initial_delay=None, max_attempts=None, deadline=None):
+        """ Start retried operation, raise CircuitOpenError if circuit is open """
+        if self.state == "open":
+            with self.circuit.lock:
+                self.circuit.metrics["rejected"] += 1
+            #
+            raise CircuitOpenError(f"Circuit is open: {self.name}")
+        #
+        with self.circuit.lock:
+            self.circuit.metrics["calls"] += 1
+        #
+        return RetryState(self, initial_delay, max_attempts, deadline)
+
+    def record_failure(self, transient=True):
+        """ Register failed attempt """
+        with self.circuit.lock:
+            self.circuit.metrics["attempts"] += 1
+            #
+            if not transient:
+                return
+            #
+            self.circuit.consecutive_failures += 1
+            #
+            if self.failure_threshold is not None and \
+                    self.circuit.consecutive_failures >= self.failure_threshold:
+                if self.circuit.opened_at is None:
+                    log.warning("Circuit opened: %s", self.name)
+                    self.circuit.metrics["circuit_opened"] += 1
+                #
+                self.circuit.opened_at = time.monotonic()
+
+    def record_success(self):
+        """ Register successful attempt """
+        with self.circuit.lock:
+            self.circuit.metrics["attempts"] += 1
+            self.circuit.consecutive_failures = 0
+            #
+            if self.circuit.opened_at is not None:
+                log.info("Circuit closed: %s", self.name)
+                self.circuit.opened_at = None
+
+    def record_wait(self, delay):
+        """ Register backoff wait """
+        with self.circuit.lock:
+            self.circuit.metrics["wait_seconds"] += delay
+
+    def record_result(self, state, succeeded):  # pylint: disable=W0613
+        """ Register operation result """
+        with self.circuit.lock:
+            self.circuit.metrics["succeeded" if succeeded else "failed"] += 1
+
+    def get_metrics(self):
+        """ Get metrics snapshot """
+        with self.circuit.lock:
+            result = self.circuit.metrics.copy()
+        #
+        result["state"] = self.state
+        return result
+
+    def call(  # pylint: disable=R0913
+            self, func, *args,
+            retry_if=None,
+            mute_first_failures=0,
+            log_errors=True,
+            stop_event=None,
+            **kwargs,
+        ):
+        """ Call func with retries, re-raise last error when exhausted """
+        state = self.begin()
+        #
+        while True:
+            try:
+                result = func(*args, **kwargs)
+            except Exception as exception:  # pylint: disable=W0703
+                if retry_if is not None and not retry_if(exception):
+                    state.failed()
+                    raise
+                #
+                delay = state.next_delay()
+                #
+                if delay is None:
+                    raise
+                #
+                if log_errors and state.attempt > mute_first_failures:
+                    log.warning(
+                        "%s: attempt %s failed (%s), retrying in %.2f seconds",
+                        self.name, state.attempt, exception, delay,
+                    )
+                #
+                if not state.sleep(delay, stop_event):
+                    raise
+                #
+                continue
+            #
+            state.succeeded()
+            return result
+
+
+def get_policy(name, config=None, **defaults):
+    """ Make policy with given settings, circuit breaker state is shared per name """
+    with policies_lock:
+        existing = policies.get(name, None)
+        #
+        policy = RetryPolicy.from_config(
+            name, config or {},
+            circuit=existing.circuit if existing is not None else None,
+            **defaults,
+        )
+        #
+        policies[name] = policy
+        return policy
+
+
+def get_retry_metrics():
+    """ Get metrics of all named policies """
+    with policies_lock:
+        items = list(policies.items())
+    #
+    return {name: policy.get_metrics() for name, policy in items}
@@ -0,0 +1,187 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Sampling profiler: collapsed stacks (flamegraph input) """
+
+import os
+import sys
+import time
+import _thread
+import threading
+import traceback
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+
+TRUNCATED_STACK = "[truncated]"
+
+
+def get_native_primitives():
+    """ Get (start_new_thread, sleep) not patched by gevent """
+    try:
+        from gevent import monkey  # pylint: disable=E0401,C0415
+        #
+        if monkey.is_module_patched("threading"):
+            return (
+                monkey.get_original("_thread", "start_new_thread"),
+                monkey.get_original("time", "sleep"),
+            )
+    except ImportError:
+        pass
+    #
+    return _thread.start_new_thread, time.sleep
+
+
+def _get_original(module_name, name):
+    try:
+        from gevent import monkey  # pylint: disable=E0401,C0415
+        return monkey.get_original(module_name, name)
+    except ImportError:
+        return getattr(sys.modules[module_name], name)
+
+
+def get_native_lock():
+    """ Make lock not patched by gevent (safe to use from native threads) """
+    return _get_original("_thread", "allocate_lock")()
+
+
+def get_native_ident():
+    """ Get OS thread ident (gevent patches get_ident to return greenlet ids) """
+    return _get_original("_thread", "get_ident")()
+
+
+def _format_frame(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:  # pylint: disable=R0902
+    """ Periodically sample stacks of all threads into bounded collapsed-stack counts """
+
+    def __init__(self, hz=50, max_stacks=10000, max_depth=64):
+        self.interval = 1.0 / max(float(hz), 1.0)
+        self.hz = hz
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        #
+        self.lock = get_native_lock()
+        self.stacks = {}
+        self.samples = 0
+        self.started = None
+        self.running = False
+        self.thread_ident = None
+        self.error = None  # set by sampling thread, logged from caller thread
+
+    def start(self):
+        """ Start sampling in native (non-gevent) thread """
+        if self.running:
+            return
+        #
+        self.running = True
+        self.started = time.time()
+        #
+        start_new_thread, _ = get_native_primitives()
+        start_new_thread(self._run, ())
+
+    def stop(self):
+        """ Stop sampling (collected data is kept) """
+        self.running = False
+        self._log_error()
+
+    def _log_error(self):
+        # Native thread must not use (gevent-patched) logging, errors are logged here
+        error, self.error = self.error, None
+        #
+        if error is not None:
+            log.error("Stack sampling failed, sampler stopped:\n%s", error)
+
+    def _run(self):
+        _, sleep = get_native_primitives()
+        self.thread_ident = get_native_ident()
+        #
+        while self.running:
+            try:
+                self.sample()
+            except:  # pylint: disable=W0702
+                self.error = traceback.format_exc()
+                self.running = False
+                break
+            #
+            sleep(self.interval)
+
+    def sample(self):
+        """ Take one sample of all threads """
+        # Copy without threading locks: those are patched by gevent
+        thread_names = {
+            ident: item.name
+            for ident, item in dict(threading._active).items()  # pylint: disable=W0212
+        }
+        collected = []
+        #
+        for thread_id, frame in sys._current_frames().items():  # pylint: disable=W0212
+            if thread_id == self.thread_ident:
+                continue
+            #
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(_format_frame(frame))
+                frame = frame.f_back
+            #
+            stack.append(thread_names.get(thread_id, f"thread-{thread_id}"))
+            collected.append(";".join(reversed(stack)))
+        #
+        with self.lock:
+            self.samples += 1
+            #
+            for key in collected:
+                if key not in self.stacks and len(self.stacks) >= self.max_stacks:
+                    key = TRUNCATED_STACK
+                #
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def snapshot(self, reset=False, top=None):
+        """ Get collected data: {running, hz, started, samples, stacks} """
+        self._log_error()
+        #
+        with self.lock:
+            stacks = self.stacks
+            samples = self.samples
+            #
+            if reset:
+                self.stacks = {}
+                self.samples = 0
+            else:
+                stacks = stacks.copy()
+        #
+        if top is not None:
+            stacks = dict(sorted(stacks.items(), key=lambda item: item[1], reverse=True)[:top])
+        #
+        return {
+            "running": self.running,
+            "hz": self.hz,
+            "started": self.started,
+            "samples": samples,
+            "stacks": stacks,
+        }
+
+    def collapsed(self, reset=False):
+        """ Get collected data in collapsed-stack format (flamegraph.pl / speedscope) """
+        stacks = self.snapshot(reset=reset)["stacks"]
+        #
+        return "\n".join(
+            f"{key} {value}" for key, value in sorted(stacks.items())
+        )
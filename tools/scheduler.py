@@ -0,0 +1,244 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Download scheduler: priorities, global/per-host concurrency and bandwidth limits """
+
+import time
+import heapq
+import itertools
+import threading
+import contextlib
+import urllib.parse
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+from .metrics import registry
+
+
+PRIORITY_PRELOAD = 0  # plus position in preload order
+PRIORITY_BUNDLE = 100000
+PRIORITY_UPDATE = 200000
+PRIORITY_MIRROR = 300000
+
+
+queue_depth = registry.gauge(
+    "bootstrap_download_queue_depth", "Downloads waiting for a scheduler slot",
+)
+active_downloads = registry.gauge(
+    "bootstrap_download_active", "Downloads holding a scheduler slot",
+)
+queue_wait = registry.histogram(
+    "bootstrap_download_queue_wait_seconds", "Time spent waiting for a scheduler slot",
+)
+throttle_wait = registry.counter(
+    "bootstrap_download_throttle_seconds_total", "Time spent in bandwidth throttling",
+)
+
+
+def get_host(url):
+    """ Get host[:port] of URL ('' if none) """
+    try:
+        return urllib.parse.urlsplit(str(url)).netloc.rsplit("@", 1)[-1]
+    except:  # pylint: disable=W0702
+        return ""
+
+
+class TokenBucket:  # pylint: disable=R0903
+    """ Bandwidth limit: rate bytes per second, burst bytes """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount):
+        """ Take amount, return seconds to wait before using it """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            #
+            if self.tokens >= 0:
+                return 0.0
+            #
+            return -self.tokens / self.rate
+
+
+class DownloadScheduler:  # pylint: disable=R0902
+    """ Grant download slots by priority (lower first, FIFO within priority) """
+
+    def __init__(self, config=None):
+        self.condition = threading.Condition(threading.Lock())
+        self.local = threading.local()
+        self.sequence = itertools.count()
+        #
+        self.waiting = []
+        self.active = 0
+        self.host_active = {}
+        #
+        self.bucket = None
+        self.host_buckets = {}
+        #
+        self.configure(config or {})
+
+    def configure(self, config):
+        """ Apply config: max_concurrent, max_per_host, bandwidth, host_bandwidth, hosts """
+        with self.condition:
+            self.max_concurrent = config.get("max_concurrent", 8)
+            self.max_per_host = config.get("max_per_host", 4)
+            self.bandwidth = config.get("bandwidth", None)
+            self.host_bandwidth = config.get("host_bandwidth", None)
+            self.hosts = config.get("hosts", {})
+            #
+            self.bucket = TokenBucket(self.bandwidth) if self.bandwidth else None
+            self.host_buckets = {}
+            #
+            self._dispatch()
+
+    def _get_host_limit(self, host, key, default):
+        return self.hosts.get(host, {}).get(key, default)
+
+    def _dispatch(self):
+        """ Grant slots to eligible waiters (under lock) """
+        granted = False
+        #
+        for waiter in sorted(self.waiting):
+            if self.max_concurrent and self.active >= self.max_concurrent:
+                break
+            #
+            host = waiter[2]
+            host_limit = self._get_host_limit(host, "max_concurrent", self.max_per_host)
+            #
+            if host_limit and self.host_active.get(host, 0) >= host_limit:
+                continue
+            #
+            waiter[3]["granted"] = True
+            self.active += 1
+            self.host_active[host] = self.host_active.get(host, 0) + 1
+            granted = True
+        #
+        if granted:
+            self.waiting = [item for item in self.waiting if not item[3]["granted"]]
+            heapq.heapify(self.waiting)
+            self.condition.notify_all()
+        #
+        queue_depth.set(len(self.waiting))
+        active_downloads.set(self.active)
+
+    @contextlib.contextmanager
+    def slot(self, url, priority=PRIORITY_PRELOAD):
+        """ Hold download slot for block (nested calls reuse the outer slot) """
+        if getattr(self.local, "depth", 0) > 0:
+            self.local.depth += 1
+            try:
+                yield
+            finally:
+                self.local.depth -= 1
+            return
+        #
+        host = get_host(url)
+        state = {"granted": False}
+        started = time.perf_counter()
+        #
+        with self.condition:
+            heapq.heappush(self.waiting, (priority, next(self.sequence), host, state))
+            self._dispatch()
+            #
+            if not state["granted"]:
+                log.debug("Download queued (priority %s): %s", priority, url)
+            #
+            try:
+                while not state["granted"]:
+                    self.condition.wait()
+            except BaseException:
+                # Interrupted wait (gevent Timeout, GreenletExit, KeyboardInterrupt):
+                # give back the slot if it was granted meanwhile, else leave the queue
+                if state["granted"]:
+                    self._release(host)
+                else:
+                    self.waiting = [item for item in self.waiting if item[3] is not state]
+                    heapq.heapify(self.waiting)
+                    self._dispatch()
+                #
+                raise
+        #
+        queue_wait.observe(time.perf_counter() - started)
+        self.local.depth = 1
+        #
+        try:
+            yield
+        finally:
+            self.local.depth = 0
+            #
+            with self.condition:
+                self._release(host)
+
+    def _release(self, host):
+        """ Return slot of host and grant it to next waiter (under lock) """
+        self.active -= 1
+        self.host_active[host] -= 1
+        #
+        if not self.host_active[host]:
+            self.host_active.pop(host)
+        #
+        self._dispatch()
+
+    def _get_host_bucket(self, host):
+        rate = self._get_host_limit(host, "bandwidth", self.host_bandwidth)
+        #
+        if not rate:
+            return None
+        #
+        with self.condition:
+            if host not in self.host_buckets:
+                self.host_buckets[host] = TokenBucket(rate)
+            #
+            return self.host_buckets[host]
+
+    def throttle(self, url, amount):
+        """ Account received bytes, sleep if bandwidth limits are exceeded """
+        buckets = [self.bucket, self._get_host_bucket(get_host(url))]
+        delay = max(
+            [bucket.reserve(amount) for bucket in buckets if bucket is not None],
+            default=0.0,
+        )
+        #
+        if delay > 0:
+            throttle_wait.inc(delay)
+            time.sleep(delay)
+
+    def status(self):
+        """ Get {active, waiting, hosts, limits} """
+        with self.condition:
+            return {
+                "active": self.active,
+                "waiting": len(self.waiting),
+                "hosts": dict(self.host_active),
+                "limits": {
+                    "max_concurrent": self.max_concurrent,
+                    "max_per_host": self.max_per_host,
+                    "bandwidth": self.bandwidth,
+                    "host_bandwidth": self.host_bandwidth,
+                    "hosts": self.hosts,
+                },
+            }
+
+
+scheduler = DownloadScheduler()
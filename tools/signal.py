@@ -17,16 +17,197 @@
 
 """ Signal """
 
+import gc
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+import traceback
+
 from pylon.core.tools import log  # pylint: disable=E0611,E0401
-from gevent.util import format_run_info  # pylint: disable=E0611,E0401
 
+from .tasks import get_task_occupancy
+
+
+def _get_rss():
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except:  # pylint: disable=W0702
+        pass
+    #
+    try:
+        import resource  # pylint: disable=C0415
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except:  # pylint: disable=W0702
+        return None
+
+
+def _get_open_fds():
+    for fd_dir in ["/proc/self/fd", "/dev/fd"]:
+        try:
+            return len(os.listdir(fd_dir))
+        except:  # pylint: disable=W0702
+            pass
+    #
+    return None
+
+
+def _collect_threads():
+    thread_names = {item.ident: item.name for item in threading.enumerate()}
+    #
+    return [
+        {
+            "ident": thread_id,
+            "name": thread_names.get(thread_id, None),
+            "stack": traceback.format_stack(frame),
+        }
+        for thread_id, frame in sys._current_frames().items()  # pylint: disable=W0212
+    ]
+
+
+def _collect_greenlets():
+    from greenlet import greenlet  # pylint: disable=E0401,C0415
+    #
+    result = []
+    #
+    for item in gc.get_objects():
+        if not isinstance(item, greenlet):
+            continue
+        #
+        result.append({
+            "name": repr(item),
+            "dead": item.dead,
+            "stack": traceback.format_stack(item.gr_frame) if item.gr_frame is not None else [],
+        })
+    #
+    return result
+
+
+def _collect_hub():
+    from gevent import get_hub  # pylint: disable=E0401,C0415
+    #
+    loop = get_hub().loop
+    result = {}
+    #
+    for key in ["backend", "activecnt", "pendingcnt", "iteration", "depth"]:
+        try:
+            result[key] = getattr(loop, key)
+        except:  # pylint: disable=W0702
+            pass
+    #
+    return result
+
+
+def _collect_run_info():
+    from gevent.util import format_run_info  # pylint: disable=E0611,E0401,C0415
+    #
+    return format_run_info()
+
+
+def collect_diagnostics(module=None):
+    """ Collect runtime diagnostics snapshot """
+    result = {
+        "time": time.time(),
+        "pid": os.getpid(),
+        "rss": _get_rss(),
+        "open_fds": _get_open_fds(),
+        "gc": {
+            "counts": gc.get_count(),
+            "thresholds": gc.get_threshold(),
+            "stats": gc.get_stats(),
+            "garbage": len(gc.garbage),
+        },
+    }
+    #
+    collectors = [
+        ("threads", _collect_threads),
+        ("greenlets", _collect_greenlets),
+        ("hub", _collect_hub),
+        ("run_info", _collect_run_info),
+    ]
+    #
+    if module is not None:
+        collectors.append(("tasks", lambda: get_task_occupancy(module)))
+    #
+    for key, collector in collectors:
+        try:
+            result[key] = collector()
+        except:  # pylint: disable=W0702
+            result[key] = None
+    #
+    return result
 
-def signal_sigusr2(signal_num, stack_frame):
+
+def write_diagnostics(diagnostics, target_dir, keep=10):
+    """ Write snapshot atomically, keep only last N snapshots, return path """
+    os.makedirs(target_dir, exist_ok=True)
+    #
+    prefix = f"bootstrap_diagnostics_{diagnostics['pid']}_"
+    path = os.path.join(target_dir, f"{prefix}{time.time_ns()}.json")
+    #
+    fd, temp_path = tempfile.mkstemp(dir=target_dir, prefix=".bootstrap_diagnostics_")
+    with os.fdopen(fd, "w", encoding="utf-8") as file:
+        json.dump(diagnostics, file, default=str, indent=1)
+    os.replace(temp_path, path)
+    #
+    if keep:
+        snapshots = sorted(
+            item for item in os.listdir(target_dir) if item.startswith(prefix)
+        )
+        #
+        for item in snapshots[:-keep]:
+            try:
+                os.remove(os.path.join(target_dir, item))
+            except OSError:
+                pass
+    #
+    return path
+
+
+def signal_sigusr2(signal_num, stack_frame, module=None):
     """ SIGUSR2 signal handler: dump runtime info """
     _ = signal_num, stack_frame
     #
-    log.info("Gevent run info:")
+    config = module.descriptor.config if module is not None else {}
+    #
+    try:
+        diagnostics = collect_diagnostics(module)
+        path = write_diagnostics(
+            diagnostics,
+            config.get(
+                "diagnostics_dir",
+                os.path.join(tempfile.gettempdir(), "bootstrap_diagnostics"),
+            ),
+            keep=config.get("diagnostics_keep", 10),
+        )
+    except:  # pylint: disable=W0702
+        log.exception("Failed to write diagnostics, logging gevent run info")
+        #
+        log.info("Gevent run info:")
+        #
+        run_info = _collect_run_info()
+        for line in run_info:
+            log.info("%s", line)
+        #
+        return
+    #
+    busy_tasks = [
+        name for name, item in (diagnostics.get("tasks", None) or {}).items()
+        if item.get("running", False) or item.get("tasks", 0)
+    ]
     #
-    run_info = format_run_info()
-    for line in run_info:
-        log.info("%s", line)
+    log.info(
+        "Diagnostics written: %s (threads: %s, greenlets: %s, rss: %s, fds: %s, gc: %s, busy tasks: %s)",
+        path,
+        len(diagnostics.get("threads", None) or []),
+        len(diagnostics.get("greenlets", None) or []),
+        diagnostics["rss"],
+        diagnostics["open_fds"],
+        diagnostics["gc"]["counts"],
+        ", ".join(busy_tasks) or "-",
+    )
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Source provider: HTTP tar/zip archives with resume and digest check """
+
+import os
+import shutil
+import zipfile
+import tarfile
+import tempfile
+
+import requests  # pylint: disable=E0401
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+from .download import download
+from .retry import get_policy
+
+
+class Provider:  # pylint: disable=R0903
+    """ Source provider """
+    verifies_digest = True  # target "digest" is checked against downloaded archive
+
+    def __init__(self, context, settings):
+        self.context = context
+        self.settings = settings
+        #
+        self.session = None
+        self.temp_dirs = []
+        #
+        self.policy = get_policy(
+            "source.http", self.settings,
+            initial_delay=self.settings.get("backoff", 1.0),
+            max_delay=self.settings.get("max_backoff", 30.0),
+            max_attempts=self.settings.get("retries", 5) + 1,
+            failure_threshold=self.settings.get("failure_threshold", 10),
+        )
+
+    def init(self):
+        """ Initialize provider """
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": "PythonMachineryEliteAClient",
+        })
+        #
+        username = self.settings.get("username", None)
+        password = self.settings.get("password", None)
+        #
+        if username is not None:
+            self.session.auth = (username, password if password is not None else "")
+
+    def deinit(self):
+        """ De-initialize provider """
+        while self.temp_dirs:
+            shutil.rmtree(self.temp_dirs.pop(), ignore_errors=True)
+        #
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    def get_source(self, target):
+        """ Download and extract source, return path """
+        source_url = target["source"]
+        digest = target.get("digest", None)
+        #
+        target_dir = tempfile.mkdtemp(prefix="bootstrap_source_")
+        self.temp_dirs.append(target_dir)
+        #
+        with tempfile.TemporaryFile() as temp_file:
+            size = download(
+                self.session, source_url, temp_file,
+                digest=digest,
+                timeout=self.settings.get("timeout", 60),
+                policy=self.policy,
+            )
+            #
+            log.info("Downloaded source: %s (%s bytes)", source_url, size)
+            #
+            if zipfile.is_zipfile(temp_file):
+                temp_file.seek(0)
+                with zipfile.ZipFile(temp_file) as zip_file:
+                    zip_file.extractall(target_dir)
+            else:
+                temp_file.seek(0)
+                with tarfile.open(mode="r", fileobj=temp_file) as tar_file:
+                    tar_file.extractall(target_dir)
+        #
+        items = os.listdir(target_dir)
+        #
+        if len(items) == 1 and os.path.isdir(os.path.join(target_dir, items[0])) and \
+                not os.path.exists(os.path.join(target_dir, "metadata.json")):
+            return os.path.join(target_dir, items[0])
+        #
+        return target_dir
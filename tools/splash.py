@@ -24,6 +24,16 @@ from pylon.core.tools import config  # pylint: disable=E0611,E0401,W0611
 
 from tools import context, this  # pylint: disable=E0401
 
+from .metrics import registry
+
+
+splash_requests = registry.counter(
+    "bootstrap_splash_requests_total", "Requests seen by maintenance splash hook by result",
+)
+auth_rpc_seconds = registry.histogram(
+    "bootstrap_splash_auth_rpc_seconds", "Latency of auth RPCs made by splash hook",
+)
+
 
 def maintenance_splash_hook(router, environ, _start_response):  # pylint: disable=R0912
     """ Router hook """
@@ -36,6 +46,7 @@ def maintenance_splash_hook(router, environ, _start_response):  # pylint: disabl
     #
     for endpoint in ["healthz", "livez", "readyz"]:
         if source_uri.startswith(f"/{endpoint}") and f"/{endpoint}/" in router.map:
+            splash_requests.inc(result="health")
             return None
     #
     source_uri = f'{context.url_prefix}{source_uri}'
@@ -56,12 +67,14 @@ def maintenance_splash_hook(router, environ, _start_response):  # pylint: disabl
     cookie_value = this.descriptor.config.get("splash_bypass_token", "bypass")
     #
     if cookie_name in cookies and cookies.get(cookie_name) == cookie_value:
+        splash_requests.inc(result="bypass")
         return None
     # Call authorize RPC
     auth_data = Holder()
     #
     try:
-        auth_status = context.rpc_manager.timeout(15).auth_authorize(source, headers, cookies)
+        with auth_rpc_seconds.time(method="auth_authorize"):
+            auth_status = context.rpc_manager.timeout(15).auth_authorize(source, headers, cookies)
     except:  # pylint: disable=W0702
         auth_data.type = "public"
         auth_data.id = "-"
@@ -86,17 +99,23 @@ def maintenance_splash_hook(router, environ, _start_response):  # pylint: disabl
     if auth_data.type == "user":
         user_id = auth_data.id
     elif auth_data.type == "token":
-        token = context.rpc_manager.timeout(15).auth_get_token(token_id=auth_data.id)
+        with auth_rpc_seconds.time(method="auth_get_token"):
+            token = context.rpc_manager.timeout(15).auth_get_token(token_id=auth_data.id)
         user_id = token["user_id"]
     else:
         user_id = None
     #
     if user_id is not None:
-        user_roles = context.rpc_manager.timeout(15).auth_get_user_roles(user_id, "administration")
+        with auth_rpc_seconds.time(method="auth_get_user_roles"):
+            user_roles = context.rpc_manager.timeout(15).auth_get_user_roles(
+                user_id, "administration",
+            )
         #
         if "admin" in user_roles:
+            splash_requests.inc(result="admin")
             return None
     #
+    splash_requests.inc(result="splash")
     return maintenance_splash_app
 
 
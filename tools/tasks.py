@@ -21,6 +21,97 @@ import time
 
 from pylon.core.tools import log  # pylint: disable=E0611,E0401
 
+from .metrics import registry
+
+
+drain_seconds = registry.gauge(
+    "bootstrap_drain_seconds", "Duration of last task drain by final state",
+)
+
+
+#
+# Targets: TaskNodes and TaskQueues inside plugins/modules
+#
+TASK_TARGETS = {
+    "indexer_worker": {
+        "queues": [
+            {
+                "queue": "index_task_queue",
+                "tasks": [
+                    "indexer_index",
+                    "indexer_index_stream",
+                ],
+            },
+        ],
+        "nodes": [
+            "agent_task_node",
+            "index_task_node",
+        ],
+    },
+    "worker_core": {
+        "queues": [
+            {
+                "queue": "task_queue_preload",
+                "tasks": [
+                    "invoke_model",
+                ],
+            },
+            {
+                "queue": "task_queue",
+                "tasks": [
+                    "indexer_ask",
+                    "indexer_ask_stream",
+                    "indexer_search",
+                    "indexer_deduplicate",
+                    "indexer_delete",
+                ],
+            },
+        ],
+        "nodes": [
+            "task_node_light",
+            "task_node_heavy",
+        ],
+    },
+}
+
+
+def get_task_occupancy(self):
+    """ Get TaskNode/TaskQueue occupancy of known targets (lock-free, best effort) """
+    result = {}
+    module_manager = self.context.module_manager
+    #
+    for plugin_name, plugin_target in TASK_TARGETS.items():
+        descriptor = module_manager.modules.get(plugin_name, None)
+        #
+        if descriptor is None or descriptor.module is None:
+            continue
+        #
+        for item in plugin_target["queues"]:
+            queue = getattr(descriptor.module, item["queue"], None)
+            if queue is None:
+                continue
+            #
+            result[f"{plugin_name}:{item['queue']}"] = {
+                "kind": "queue",
+                "tasks": len(getattr(queue, "tasks", None) or []),
+            }
+        #
+        for node_name in plugin_target["nodes"]:
+            node = getattr(descriptor.module, node_name, None)
+            if node is None:
+                continue
+            #
+            have_running_tasks = getattr(node, "have_running_tasks", None)
+            #
+            result[f"{plugin_name}:{node_name}"] = {
+                "kind": "node",
+                "started": getattr(node, "started", None),
+                "running": have_running_tasks.is_set() \
+                    if have_running_tasks is not None else None,
+            }
+    #
+    return result
+
 
 def wait_for_tasks(self):  # pylint: disable=R0912,R0914,R0915
     """ Wait for running tasks to stop """
@@ -46,55 +137,24 @@ def wait_for_tasks(self):  # pylint: disable=R0912,R0914,R0915
         #
         return abs(time.time() - wait_started) >= timeout
     #
+    def _set_status(state, waiting=None):
+        self.drain_status = {
+            "state": state,
+            "started": wait_started,
+            "finished": None if state == "draining" else time.time(),
+            "waiting": waiting or [],
+        }
+        #
+        if state != "draining":
+            drain_seconds.set(time.time() - wait_started, state=state)
+    #
     if _is_timeout():
+        _set_status("skipped")
         return
     #
+    _set_status("draining")
     log.info("Waiting for tasks to stop")
     #
-    # Targets: TaskNodes and TaskQueues inside plugins/modules
-    #
-    targets = {
-        "indexer_worker": {
-            "queues": [
-                {
-                    "queue": "index_task_queue",
-                    "tasks": [
-                        "indexer_index",
-                        "indexer_index_stream",
-                    ],
-                },
-            ],
-            "nodes": [
-                "agent_task_node",
-                "index_task_node",
-            ],
-        },
-        "worker_core": {
-            "queues": [
-                {
-                    "queue": "task_queue_preload",
-                    "tasks": [
-                        "invoke_model",
-                    ],
-                },
-                {
-                    "queue": "task_queue",
-                    "tasks": [
-                        "indexer_ask",
-                        "indexer_ask_stream",
-                        "indexer_search",
-                        "indexer_deduplicate",
-                        "indexer_delete",
-                    ],
-                },
-            ],
-            "nodes": [
-                "task_node_light",
-                "task_node_heavy",
-            ],
-        },
-    }
-    #
     # Commons
     #
     module_manager = self.context.module_manager
@@ -103,7 +163,7 @@ def wait_for_tasks(self):  # pylint: disable=R0912,R0914,R0915
     #
     wait_queues = []
     #
-    for plugin_name, plugin_target in targets.items():
+    for plugin_name, plugin_target in TASK_TARGETS.items():
         if plugin_name not in module_manager.modules:
             continue
         #
@@ -130,6 +190,7 @@ def wait_for_tasks(self):  # pylint: disable=R0912,R0914,R0915
                     #
                     if not isinstance(queue.task_node.task_registry[task_name], list):
                         log.info("Looks like legacy arbiter, skipping task waiting")
+                        _set_status("skipped")
                         return
                     #
                     log.info(
@@ -150,19 +211,24 @@ def wait_for_tasks(self):  # pylint: disable=R0912,R0914,R0915
             break
         #
         have_queue_tasks = False
+        waiting = []
         #
         for queue_name, queue in wait_queues:
             with queue.lock:
                 if queue.tasks:
                     log.info("Queue %s still has tasks, waiting", queue_name)
                     have_queue_tasks = True
+                    waiting.append(f"queue:{queue_name}")
         #
         if not have_queue_tasks:
             log.info("No more TaskQueues with tasks")
             break
         #
+        _set_status("draining", waiting)
+        #
         if _is_timeout():
             log.info("Task wait timeout reached")
+            _set_status("timeout", waiting)
             return
         #
         time.sleep(self.descriptor.config.get("task_wait_interval", 15))
@@ -171,7 +237,7 @@ def wait_for_tasks(self):  # pylint: disable=R0912,R0914,R0915
     #
     wait_nodes = []
     #
-    for plugin_name, plugin_target in targets.items():
+    for plugin_name, plugin_target in TASK_TARGETS.items():
         if plugin_name not in module_manager.modules:
             continue
         #
@@ -208,22 +274,28 @@ def wait_for_tasks(self):  # pylint: disable=R0912,R0914,R0915
             break
         #
         have_node_tasks = False
+        waiting = []
         #
         for node_name, node in wait_nodes:
             if node.have_running_tasks.is_set():
                 log.info("Node %s still has tasks, waiting", node_name)
                 have_node_tasks = True
+                waiting.append(f"node:{node_name}")
         #
         if not have_node_tasks:
             log.info("No more TaskNodes with tasks")
             break
         #
+        _set_status("draining", waiting)
+        #
         if _is_timeout():
             log.info("Task wait timeout reached")
+            _set_status("timeout", waiting)
             return
         #
         time.sleep(self.descriptor.config.get("task_wait_interval", 15))
     #
     # Done
     #
+    _set_status("done")
     log.info("Task wait completed")
@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Boot timeline """
+
+import os
+import time
+import threading
+import contextlib
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+
+def get_tree_size(path):
+    """ Get total size of files in tree """
+    result = 0
+    #
+    if path is None or not os.path.exists(path):
+        return 0
+    #
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    #
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [item for item in dirs if item not in [".git", "__pycache__"]]
+        #
+        for name in files:
+            try:
+                result += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    #
+    return result
+
+
+class BootTimeline:
+    """ Timeline of bootstrap phases (monotonic, relative to timeline start) """
+
+    def __init__(self):
+        self.origin = time.monotonic()
+        self.entries = []
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name, plugin=None):
+        """ Record phase, yields entry dict (e.g. to set 'bytes') """
+        entry = {
+            "phase": name,
+            "plugin": plugin,
+            "start": round(time.monotonic() - self.origin, 6),
+            "end": None,
+            "duration": None,
+            "bytes": None,
+            "ok": True,
+        }
+        #
+        with self.lock:
+            self.entries.append(entry)
+        #
+        try:
+            yield entry
+        except:  # pylint: disable=W0702
+            entry["ok"] = False
+            raise
+        finally:
+            end = time.monotonic() - self.origin
+            entry["end"] = round(end, 6)
+            entry["duration"] = round(end - entry["start"], 6)
+
+    def to_list(self):
+        """ Get copy of entries """
+        with self.lock:
+            return [entry.copy() for entry in self.entries]
+
+    def summary(self):
+        """ Get per-phase totals: {phase: {count, duration, bytes, failed}} """
+        result = {}
+        #
+        for entry in self.to_list():
+            item = result.setdefault(entry["phase"], {
+                "count": 0,
+                "duration": 0.0,
+                "bytes": 0,
+                "failed": 0,
+            })
+            #
+            item["count"] += 1
+            item["duration"] += entry["duration"] or 0.0
+            item["bytes"] += entry["bytes"] or 0
+            #
+            if not entry["ok"]:
+                item["failed"] += 1
+        #
+        return result
+
+    def log_summary(self, title="Boot timeline"):
+        """ Log summary table """
+        lines = [
+            f"{'Phase':<24} {'Count':>6} {'Seconds':>10} {'Bytes':>14} {'Failed':>6}",
+        ]
+        #
+        for name, item in self.summary().items():
+            lines.append(
+                f"{name:<24} {item['count']:>6} {item['duration']:>10.3f} "
+                f"{item['bytes']:>14} {item['failed']:>6}"
+            )
+        #
+        slowest = sorted(
+            [entry for entry in self.to_list() if entry["plugin"] is not None],
+            key=lambda entry: entry["duration"] or 0.0,
+            reverse=True,
+        )[:5]
+        #
+        for entry in slowest:
+            lines.append(
+                f"  slowest: {entry['phase']} {entry['plugin']} {entry['duration']:.3f}s"
+            )
+        #
+        log.info("%s:\n%s", title, "\n".join(lines))
@@ -0,0 +1,647 @@
+#!/usr/bin/python3
+# coding=utf-8
+
+#   Copyright 2026 getcarrier.io
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Update """
+
+import os
+import time
+import queue
+import shutil
+import tempfile
+import threading
+import concurrent.futures
+
+from pylon.core.tools import log  # pylint: disable=E0611,E0401
+
+from .scheduler import scheduler, PRIORITY_UPDATE
+
+
+RESTART_ACTIONS = ["delete_requirements", "update_pylon_config"]
+
+
+def is_version_newer(version, other_version):
+    """ Check if version is newer than other_version """
+    def _key(value):
+        result = []
+        #
+        for item in str(value).split("."):
+            try:
+                result.append((int(item), ""))
+            except:  # pylint: disable=W0702
+                result.append((-1, item))
+        #
+        return result
+    #
+    return _key(version) > _key(other_version)
+
+
+class UpdateTransaction:  # pylint: disable=R0902
+    """ Staged runtime update: stage, validate, apply, commit or rollback """
+
+    def __init__(self, module):
+        self.module = module
+        self.module_manager = module.context.module_manager
+        #
+        self.plugins_provider = self.module_manager.providers["plugins"]
+        self.requirements_provider = self.module_manager.providers["requirements"]
+        self.config_provider = self.module_manager.providers["config"]
+        #
+        self.work_dir = None
+        #
+        self.staged_plugins = {}
+        self.deleted_plugins = []
+        self.current_plugins = []
+        self.dependencies = []
+        self.staged_configs = {}
+        #
+        self.plugin_backups = {}
+        self.config_backups = {}
+        #
+        self.applied_plugins = []
+        self.applied_configs = []
+        #
+        self.reconfig_failed = []
+        self.errors = []
+
+    def _get_work_dir(self):
+        if self.work_dir is None:
+            self.work_dir = tempfile.mkdtemp(prefix="bootstrap_update_")
+        #
+        return self.work_dir
+
+    def _get_plugin_path(self, plugin):
+        plugins_path = getattr(self.plugins_provider, "path", None)
+        #
+        if plugins_path is None:
+            return None
+        #
+        return os.path.join(plugins_path, plugin)
+
+    def _set_installed(self, plugin, value):
+        try:
+            from pylon.core.tools.module import state  # pylint: disable=E0611,E0401,C0415
+            #
+            plugin_state = state.get(plugin)
+            plugin_state["installed"] = value
+            state.set(plugin, plugin_state)
+        except:  # pylint: disable=W0702
+            pass
+
+    #
+    # Stage
+    #
+
+    def _fetch_plugin(self, plugin, dependency=False):  # pylint: disable=R0911
+        """ Fetch plugin metadata and (if needed) source, return fetch result """
+        result = {
+            "plugin": plugin,
+            "status": "error",
+            "installed": self.plugins_provider.plugin_exists(plugin),
+            "metadata": None,
+            "source": None,
+            "error": None,
+        }
+        #
+        repo_resolver = self.module.repo_resolver
+        #
+        if repo_resolver is None:
+            result["error"] = f"Plugin {plugin}: repo resolver is not initialized"
+            return result
+        #
+        try:
+            found = repo_resolver.find(plugin, cached=False)
+            #
+            if found is None:
+                if dependency and result["installed"]:
+                    result["status"] = "current"
+                    result["metadata"] = self.plugins_provider.get_plugin_metadata(plugin)
+                else:
+                    result["error"] = f"Plugin {plugin}: not known by repo resolver(s)"
+                #
+                return result
+            #
+            resolver, plugin_info = found
+            #
+            source_target = plugin_info["source"].copy()
+            source_type = source_target.pop("type")
+            #
+            if source_type not in ["git", "http_tar", "http_zip"]:
+                result["error"] = f"Plugin {plugin}: source type {source_type} is not supported"
+                return result
+            #
+            metadata_url = plugin_info["objects"]["metadata"]
+            result["metadata"] = resolver.metadata_provider.get_metadata({"source": metadata_url})
+            #
+            if dependency and result["installed"]:
+                local_metadata = self.plugins_provider.get_plugin_metadata(plugin)
+                #
+                if not is_version_newer(
+                        result["metadata"].get("version", "0.0.0"),
+                        local_metadata.get("version", "0.0.0"),
+                ):
+                    result["status"] = "current"
+                    return result
+            #
+            with scheduler.slot(source_target.get("source", None), PRIORITY_UPDATE):
+                result["source"] = resolver.source_provider.get_source(source_target)
+            result["status"] = "staged"
+        except:  # pylint: disable=W0702
+            log.exception("Failed to stage plugin: %s", plugin)
+            result["error"] = f"Plugin {plugin}: failed to fetch metadata or source"
+        #
+        return result
+
+    def stage_plugins(self, plugins, resolve_dependencies=True, workers=4):
+        """ Stage plugins and their missing or outdated dependencies """
+        known_plugins = set(self.staged_plugins)
+        #
+        wave = []
+        for plugin in plugins:
+            if plugin not in known_plugins:
+                known_plugins.add(plugin)
+                wave.append((plugin, False))
+        #
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            while wave:
+                results = list(executor.map(
+                    lambda item: self._fetch_plugin(*item), wave,
+                ))
+                #
+                wave = []
+                #
+                for result in results:
+                    plugin = result["plugin"]
+                    #
+                    if result["status"] == "error":
+                        self.errors.append(result["error"])
+                        continue
+                    #
+                    if result["status"] == "current":
+                        self.current_plugins.append(plugin)
+                    else:
+                        if plugin in self.deleted_plugins:
+                            self.deleted_plugins.remove(plugin)
+                        #
+                        self.staged_plugins[plugin] = {
+                            "source": result["source"],
+                            "metadata": result["metadata"],
+                            "installed": result["installed"],
+                        }
+                        #
+                        log.info(
+                            "Staged plugin %s version %s", plugin,
+                            result["metadata"].get("version", "0.0.0"),
+                        )
+                    #
+                    if not resolve_dependencies:
+                        continue
+                    #
+                    for dependency in result["metadata"].get("depends_on", []):
+                        if dependency in known_plugins or dependency in self.deleted_plugins:
+                            continue
+                        #
+                        known_plugins.add(dependency)
+                        self.dependencies.append(dependency)
+                        wave.append((dependency, True))
+        #
+        return not self.errors
+
+    def stage_delete(self, plugin):
+        """ Mark plugin for deletion """
+        self.staged_plugins.pop(plugin, None)
+        #
+        if plugin not in self.deleted_plugins:
+            self.deleted_plugins.append(plugin)
+
+    def stage_config(self, plugin, config_data):
+        """ Stage plugin config data """
+        self.staged_configs[plugin] = config_data
+
+    def get_plan(self):
+        """ Get staged update plan """
+        return {
+            "install": [
+                plugin for plugin, item in self.staged_plugins.items() if not item["installed"]
+            ],
+            "update": [
+                plugin for plugin, item in self.staged_plugins.items() if item["installed"]
+            ],
+            "delete": list(self.deleted_plugins),
+            "dependencies": list(self.dependencies),
+            "current": list(self.current_plugins),
+            "configs": list(self.staged_configs),
+            "versions": {
+                plugin: item["metadata"].get("version", "0.0.0")
+                for plugin, item in self.staged_plugins.items()
+            },
+            "errors": list(self.errors),
+        }
+
+    def _can_reconfig(self, plugin):
+        descriptor = self.module_manager.descriptors.get(plugin, None)
+        #
+        if descriptor is None or descriptor.module is None:
+            return True  # not loaded: new config is picked up on load
+        #
+        for klass in type(descriptor.module).__mro__:
+            if klass.__name__ == "ModuleModel":
+                return False
+            #
+            if "reconfig" in klass.__dict__:
+                return True
+        #
+        return False
+
+    def get_restart_reasons(self, actions=None, exempt=None):
+        """ Get list of changes that can not be applied without restart """
+        result = []
+        exempt = exempt or {}
+        #
+        for plugin in self.deleted_plugins:
+            if plugin not in exempt.get("plugins", []):
+                result.append(f"plugin {plugin} deleted")
+        #
+        for plugin in self.staged_plugins:
+            if plugin not in exempt.get("plugins", []):
+                result.append(f"plugin {plugin} installed or updated")
+        #
+        for plugin in self.staged_configs:
+            if plugin in exempt.get("configs", []):
+                continue
+            #
+            if plugin in self.reconfig_failed:
+                result.append(f"plugin {plugin} failed to apply config in place")
+            elif not self._can_reconfig(plugin):
+                result.append(f"plugin {plugin} does not support config reload")
+        #
+        for action in actions or []:
+            if not isinstance(action, str):
+                action = action[0]
+            #
+            if action in RESTART_ACTIONS and action not in exempt.get("actions", []):
+                result.append(f"action {action}")
+        #
+        return result
+
+    #
+    # Validate
+    #
+
+    def validate(self):
+        """ Check staged plugins: metadata present, dependencies satisfied """
+        for plugin, item in self.staged_plugins.items():
+            metadata = item["metadata"]
+            source = item["source"]
+            #
+            if not isinstance(metadata, dict) or not metadata:
+                self.errors.append(f"Plugin {plugin}: metadata is missing")
+                continue
+            #
+            if not os.path.isfile(os.path.join(source, "metadata.json")):
+                self.errors.append(f"Plugin {plugin}: source has no metadata.json")
+                continue
+            #
+            for dependency in metadata.get("depends_on", []):
+                if dependency in self.staged_plugins:
+                    continue
+                #
+                if dependency not in self.deleted_plugins and \
+                        self.plugins_provider.plugin_exists(dependency):
+                    continue
+                #
+                self.errors.append(f"Plugin {plugin}: dependency {dependency} is not satisfied")
+        #
+        return not self.errors
+
+    #
+    # Apply
+    #
+
+    def _backup_plugin(self, plugin):
+        if plugin in self.plugin_backups:
+            return
+        #
+        if not self.plugins_provider.plugin_exists(plugin):
+            self.plugin_backups[plugin] = None
+            return
+        #
+        plugin_path = self._get_plugin_path(plugin)
+        #
+        if plugin_path is None or not os.path.isdir(plugin_path):
+            log.warning("Cannot backup plugin %s, rollback will not restore it", plugin)
+            return
+        #
+        backup_path = os.path.join(self._get_work_dir(), "plugins", plugin)
+        shutil.copytree(plugin_path, backup_path, symlinks=True)
+        #
+        self.plugin_backups[plugin] = backup_path
+
+    def _backup_config(self, plugin):
+        try:
+            self.config_backups[plugin] = self.config_provider.get_config_data(plugin)
+        except:  # pylint: disable=W0702
+            self.config_backups[plugin] = None
+
+    def apply(self):
+        """ Replace installed plugins and configs with staged ones """
+        for plugin in self.deleted_plugins:
+            log.info("Deleting plugin: %s", plugin)
+            #
+            self._backup_plugin(plugin)
+            self.applied_plugins.append(plugin)
+            #
+            if self.plugins_provider.plugin_exists(plugin):
+                self.plugins_provider.delete_plugin(plugin)
+        #
+        for plugin, item in self.staged_plugins.items():
+            if self.plugins_provider.plugin_exists(plugin):
+                log.info("Updating plugin: %s", plugin)
+            else:
+                log.info("Installing plugin: %s", plugin)
+            #
+            self._backup_plugin(plugin)
+            self.applied_plugins.append(plugin)
+            #
+            self.plugins_provider.add_plugin(plugin, item["source"])
+        #
+        for plugin, config_data in self.staged_configs.items():
+            log.info("Updating config: %s", plugin)
+            #
+            self._backup_config(plugin)
+            self.applied_configs.append(plugin)
+            #
+            self.config_provider.add_config_data(plugin, config_data)
+
+    def rollback(self):
+        """ Restore plugins and configs replaced by apply() """
+        while self.applied_configs:
+            plugin = self.applied_configs.pop()
+            backup = self.config_backups.get(plugin, None)
+            #
+            log.info("Rolling back config: %s", plugin)
+            #
+            try:
+                if backup is not None:
+                    self.config_provider.add_config_data(plugin, backup)
+                else:
+                    self.config_provider.delete_config_data(plugin)
+            except:  # pylint: disable=W0702
+                log.exception("Failed to roll back config: %s", plugin)
+        #
+        while self.applied_plugins:
+            plugin = self.applied_plugins.pop()
+            #
+            if plugin not in self.plugin_backups:
+                log.error("No backup for plugin %s, leaving as is", plugin)
+                continue
+            #
+            backup = self.plugin_backups[plugin]
+            #
+            log.info("Rolling back plugin: %s", plugin)
+            #
+            try:
+                if backup is not None:
+                    self.plugins_provider.add_plugin(plugin, backup)
+                elif self.plugins_provider.plugin_exists(plugin):
+                    self.plugins_provider.delete_plugin(plugin)
+            except:  # pylint: disable=W0702
+                log.exception("Failed to roll back plugin: %s", plugin)
+        #
+        self._remove_staged_sources()
+
+    def _remove_staged_sources(self):
+        """ Remove fetched source trees of staged plugins """
+        for item in self.staged_plugins.values():
+            source = item.get("source", None)
+            #
+            if source is not None:
+                shutil.rmtree(source, ignore_errors=True)
+                item["source"] = None
+
+    def commit(self):
+        """ Finalize applied changes: requirements, state, in-place config reload """
+        for plugin in self.deleted_plugins:
+            self.requirements_provider.delete_requirements(plugin)
+            self._set_installed(plugin, False)
+        #
+        for plugin, item in self.staged_plugins.items():
+            self._set_installed(plugin, False)
+            #
+            log.info(
+                "Plugin %s updated to version %s",
+                plugin, item["metadata"].get("version", "0.0.0"),
+            )
+        #
+        for plugin in self.staged_configs:
+            if plugin not in self.module_manager.descriptors:
+                continue
+            #
+            descriptor = self.module_manager.descriptors[plugin]
+            descriptor.load_config()
+            #
+            try:
+                if descriptor.module is not None:
+                    descriptor.module.reconfig()
+            except:  # pylint: disable=W0702
+                log.exception("Failed to re-configure plugin: %s", plugin)
+                self.reconfig_failed.append(plugin)
+        #
+        self._remove_staged_sources()
+
+    def cleanup(self):
+        """ Remove backups and staging data """
+        self._remove_staged_sources()
+        #
+        if self.work_dir is not None:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+            self.work_dir = None
+
+    #
+    # Run
+    #
+
+    def run(self):
+        """ Validate, apply and commit; roll back on error. Return True on success """
+        try:
+            if not self.validate():
+                for error in self.errors:
+                    log.error("Update validation failed: %s", error)
+                #
+                return False
+            #
+            try:
+                self.apply()
+            except:  # pylint: disable=W0702
+                log.exception("Failed to apply update, rolling back")
+                self.rollback()
+                return False
+            #
+            self.commit()
+            return True
+        finally:
+            self.cleanup()
+
+
+def _get_payload_items(payload):
+    """ Get names of plugins, configs and actions of payload """
+    return {
+        "plugins": {plugin.lstrip("!") for plugin in payload.get("plugins", [])},
+        "configs": set(payload.get("configs", {})),
+        "actions": {
+            action if isinstance(action, str) else action[0]
+            for action in payload.get("actions", [])
+        },
+    }
+
+
+def merge_payloads(payloads):  # pylint: disable=R0912,R0914
+    """ Merge several runtime update payloads into one, later payloads win """
+    result = {}
+    #
+    plugin_operations = {}
+    configs = {}
+    actions = []
+    reload_plugins = []
+    restart_values = []
+    #
+    for payload in payloads:
+        for plugin in payload.get("plugins", []):
+            name = plugin.lstrip("!")
+            plugin_operations.pop(name, None)  # superseded: keep latest position
+            plugin_operations[name] = plugin
+        #
+        configs.update(payload.get("configs", {}))
+        #
+        for action in payload.get("actions", []):
+            if action in actions:
+                actions.remove(action)
+            #
+            actions.append(action)
+        #
+        for plugin in payload.get("reload", []):
+            if plugin not in reload_plugins:
+                reload_plugins.append(plugin)
+        #
+        restart_values.append(payload.get("restart", "auto"))
+        #
+        for key in ["pylon_id", "pylon_pid", "resolve_dependencies"]:
+            if key in payload:
+                result[key] = payload[key]
+        #
+        if payload.get("precompile", False):
+            result["precompile"] = True
+    #
+    result["plugins"] = list(plugin_operations.values())
+    result["configs"] = configs
+    result["actions"] = actions
+    result["reload"] = reload_plugins
+    #
+    # Restart if any payload needs it: True wins, all False is False, otherwise
+    # "auto" is resolved on changes of non-False payloads (restart_exempt: the rest)
+    if any(value is True for value in restart_values):
+        result["restart"] = True
+    elif all(value is False for value in restart_values):
+        result["restart"] = False
+    else:
+        result["restart"] = "auto"
+        #
+        exempt = {"plugins": set(), "configs": set(), "actions": set()}
+        needed = {"plugins": set(), "configs": set(), "actions": set()}
+        #
+        for payload, value in zip(payloads, restart_values):
+            target = exempt if value is False else needed
+            #
+            for key, items in _get_payload_items(payload).items():
+                target[key].update(items)
+        #
+        if any(exempt.values()):
+            result["restart_exempt"] = {
+                key: sorted(items - needed[key]) for key, items in exempt.items()
+            }
+    #
+    return result
+
+
+class UpdateCoalescer(threading.Thread):  # pylint: disable=R0903
+    """ Queue runtime updates and apply ones arriving close together as one """
+
+    def __init__(self, module, callback, config):
+        super().__init__(daemon=True)
+        self.module = module
+        self.callback = callback
+        self.config = config
+        #
+        self.window = self.config.get("update_coalesce_window", 5)
+        self.max_wait = self.config.get("update_coalesce_max_wait", 60)
+        #
+        self.queue = queue.Queue()
+
+    def submit(self, payload):
+        """ Queue payload """
+        self.queue.put(payload)
+
+    def _collect(self, first_payload):
+        payloads = [first_payload]
+        #
+        started = time.monotonic()
+        #
+        while True:
+            timeout = min(
+                self.window,
+                self.max_wait - (time.monotonic() - started),
+            )
+            #
+            if timeout <= 0:
+                break
+            #
+            try:
+                payload = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            #
+            if payload.get("dry_run", False):
+                return payloads, payload  # dry runs are not merged, handle after this batch
+            #
+            payloads.append(payload)
+        #
+        return payloads, None
+
+    def run(self):
+        """ Run thread """
+        while not self.module.stop_event.is_set():
+            try:
+                try:
+                    payload = self.queue.get(timeout=1)
+                except queue.Empty:
+                    continue
+                #
+                if payload.get("dry_run", False) or not self.window:
+                    self.callback(self.module, payload)
+                    continue
+                #
+                payloads, dry_run_payload = self._collect(payload)
+                #
+                if len(payloads) > 1:
+                    log.info("Coalesced %s runtime updates", len(payloads))
+                #
+                try:
+                    self.callback(self.module, merge_payloads(payloads))
+                finally:
+                    if dry_run_payload is not None:
+                        self.callback(self.module, dry_run_payload)
+            except:  # pylint: disable=W0702
+                log.exception("Exception in update coalescer thread, continuing")